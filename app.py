@@ -1,19 +1,18 @@
 import streamlit as st
-import pandas as pd
-from dataclasses import asdict
-from main import GoogleMapsScraper
-from locations import AREA_MAPPINGS
+from main import GoogleMapsScraper, PLACE_FIELDS, launch_browser
+from playwright.async_api import async_playwright
+from locations import AREAS, ALLOWED_BY_AREA, EXCLUDED_BY_AREA
 import time
 import asyncio
 import sys
 import base64
+from html import escape
 import os
 import io
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
 
 import threading
+from collections import deque
+from itertools import islice
 import logging
 
 # Fix for Windows asyncio loop policy
@@ -25,13 +24,17 @@ st.set_page_config(page_title="Beyond Ads Scraper", page_icon="🚀", layout="wi
 # -------------------------------------------------------
 # Scraper Thread Function
 # -------------------------------------------------------
-def run_scraper_thread(search_query, total_target, required_area, excluded_areas, allowed_areas, results_list, stop_event, status_dict):
+# Seconds the shared browser stays warm waiting for the next search
+WORKER_IDLE_TIMEOUT = 300
+
+async def run_scraper_job(search_query, total_target, required_area, excluded_areas, allowed_areas, results_list, results_lock, excel_export, stop_event, status_dict, browser=None):
+    scraper = None
     try:
         status_dict["text"] = "Initializing browser..."
         scraper = GoogleMapsScraper()
         
         status_dict["text"] = "Navigating to Google Maps..."
-        success = scraper.start(search_query, total_target, required_area, excluded_areas, allowed_areas)
+        success = await scraper.start(search_query, total_target, required_area, excluded_areas, allowed_areas, browser=browser)
         
         if not success:
             status_dict["text"] = "Failed to find results (Timeout or Blocking)."
@@ -39,42 +42,116 @@ def run_scraper_thread(search_query, total_target, required_area, excluded_areas
             return
 
         status_dict["text"] = "Scraping in progress..."
-        while len(scraper.places) < total_target and not stop_event.is_set():
-            # Perform one step
-            item = scraper.step(should_stop_callback=stop_event.is_set)
-            
-            if item:
-                # Thread-safe append (lists are thread-safe in CPython for append)
-                results_list.append(asdict(item))
+
+        def on_place(item):
+            # Guarded explicitly: list.append is only atomic thanks to the GIL,
+            # which free-threaded builds do not have
+            row = item.to_dict()
+            with results_lock:
+                results_list.append(row)
+                excel_export.add_row(row)
                 status_dict["text"] = f"Found: {item.name}"
-            
-            # Check if scraper is stuck or finished (replicating logic from main.py)
-            # Also check stop event here just in case
-            if stop_event.is_set():
-                break
-            listings_locator = scraper.page.locator('//a[contains(@href, "https://www.google.com/maps/place")]')
-            try:
-                listings_count = listings_locator.count()
-                if scraper.processed_count >= listings_count:
-                    # Try scroll
-                    status_dict["text"] = "Scrolling for more results..."
-                    scraper.page.mouse.wheel(0, 10000)
-                    scraper.page.wait_for_timeout(2000)
-                    if scraper.page.locator('//a[contains(@href, "https://www.google.com/maps/place")]').count() <= listings_count:
-                        # No new results after scroll
-                        status_dict["text"] = "No more results found."
-                        break
-            except:
-                break
-                
-            time.sleep(0.1)
-
-        scraper.stop()
+        
+        # Scrolls and extracts in parallel tabs until the target, the end of the list or Stop
+        await scraper.run(on_place, should_stop_callback=stop_event.is_set)
+
         status_dict["text"] = "Finished."
     except Exception as e:
         status_dict["text"] = f"Error: {str(e)}"
         status_dict["error"] = True
         logging.error(f"Thread error: {e}")
+    finally:
+        # Always release the context, otherwise it would outlive the search in a pooled browser
+        if scraper:
+            try: await scraper.stop()
+            except Exception: pass
+        with results_lock:
+            excel_export.close()
+
+class SharedBrowser:
+    """
+    One Chromium shared by every session of this Streamlit process.
+    Playwright objects are bound to the event loop that created them, so all searches
+    run as tasks on a single background loop (see get_scraper_loop) and each gets its own
+    context. The browser is launched on first use and closed after WORKER_IDLE_TIMEOUT
+    seconds without a running search.
+    """
+    def __init__(self):
+        self.playwright = None
+        self.browser = None
+        self.active_jobs = 0
+        self.idle_timer = None
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            self.active_jobs += 1
+            if self.idle_timer:
+                self.idle_timer.cancel()
+                self.idle_timer = None
+            if self.browser is None or not self.browser.is_connected():
+                await self.close_browser()
+                try:
+                    self.playwright = await async_playwright().start()
+                    self.browser = await launch_browser(self.playwright)
+                except Exception as e:
+                    # The scraper will launch (and report) on its own; the next search retries the pool
+                    logging.error(f"Failed to launch pooled browser: {e}")
+                    await self.close_browser()
+            return self.browser
+
+    async def release(self):
+        async with self.lock:
+            self.active_jobs -= 1
+            if self.active_jobs == 0 and self.browser:
+                loop = asyncio.get_running_loop()
+                self.idle_timer = loop.call_later(
+                    WORKER_IDLE_TIMEOUT, lambda: loop.create_task(self.close_if_idle())
+                )
+
+    async def close_if_idle(self):
+        async with self.lock:
+            if self.active_jobs == 0:
+                self.idle_timer = None
+                await self.close_browser()
+
+    async def close_browser(self):
+        if self.browser:
+            try: await self.browser.close()
+            except Exception: pass
+        if self.playwright:
+            try: await self.playwright.stop()
+            except Exception: pass
+        self.browser = None
+        self.playwright = None
+
+@st.cache_resource(show_spinner=False)
+def get_scraper_loop():
+    """
+    Starts the process-wide scraper event loop on a daemon thread, with its SharedBrowser.
+    Cached as a resource, so every session and rerun reuses the same loop and browser.
+    """
+    loop = asyncio.new_event_loop()
+    # Daemon thread ensures it dies if main process dies
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop, SharedBrowser()
+
+async def run_pooled_job(shared_browser, args, done_event):
+    try:
+        browser = await shared_browser.acquire()
+        try:
+            await run_scraper_job(*args, browser=browser)
+        finally:
+            await shared_browser.release()
+    finally:
+        done_event.set()
+
+def submit_scrape_job(args, done_event):
+    """
+    Schedules a search on the shared scraper loop; `done_event` is set when it ends.
+    """
+    loop, shared_browser = get_scraper_loop()
+    asyncio.run_coroutine_threadsafe(run_pooled_job(shared_browser, args, done_event), loop)
 
 # -------------------------------------------------------
 # Session State Initialization
@@ -87,10 +164,14 @@ if "start_time" not in st.session_state:
     st.session_state.start_time = 0
 if "search_query" not in st.session_state:
     st.session_state.search_query = ""
+if "excel_export" not in st.session_state:
+    st.session_state.excel_export = None
+if "results_lock" not in st.session_state:
+    st.session_state.results_lock = threading.Lock()
 if "stop_event" not in st.session_state:
     st.session_state.stop_event = None
-if "scraper_thread" not in st.session_state:
-    st.session_state.scraper_thread = None
+if "scrape_done" not in st.session_state:
+    st.session_state.scrape_done = None
 if "status_dict" not in st.session_state:
     st.session_state.status_dict = {"text": "", "error": False}
 
@@ -103,15 +184,21 @@ if "is_paused" in st.session_state:
 # -------------------------------------------------------
 # Utility Functions
 # -------------------------------------------------------
+# Search query -> download file name ("a b, c/d" -> "a_b_c-d") in a single pass
+SAFE_FILENAME_TABLE = str.maketrans({" ": "_", ",": "", "/": "-"})
+
+@st.cache_data(show_spinner=False)
 def get_base64_of_bin_file(bin_file):
     with open(bin_file, 'rb') as f:
         data = f.read()
     return base64.b64encode(data).decode()
 
-def set_png_as_page_bg(png_file):
-    if not os.path.exists(png_file):
-        return
-    
+@st.cache_data(show_spinner=False)
+def build_page_bg_html(png_file):
+    """
+    Builds the <style> block for the page background and theme.
+    Cached so reruns skip the file read, base64 encode and CSS formatting.
+    """
     bin_str = get_base64_of_bin_file(png_file)
     mime_type = "image/png"
     if png_file.lower().endswith(".jpg") or png_file.lower().endswith(".jpeg"):
@@ -218,7 +305,128 @@ def set_png_as_page_bg(png_file):
     }
     </style>
     ''' % (mime_type, bin_str)
-    st.markdown(page_bg_img, unsafe_allow_html=True)
+    return page_bg_img
+
+def set_png_as_page_bg(png_file):
+    if not os.path.exists(png_file):
+        return
+    st.markdown(build_page_bg_html(png_file), unsafe_allow_html=True)
+
+class LiveExcelExport:
+    """
+    Excel workbook filled row by row while the scrape runs.
+    constant_memory streams each finished row to a temp file, so rows are not held a
+    second time as cell objects and the download is ready as soon as the search ends.
+    """
+    LINK_FIELDS = ("website", "instagram")
+    LINK_PREFIXES = ("http://", "https://")
+
+    def __init__(self, fields):
+        import xlsxwriter # Deferred: only needed once a search is submitted
+        
+        self.fields = tuple(fields)
+        self.buffer = io.BytesIO()
+        # URL detection is done on the link columns only instead of on every string cell
+        self.workbook = xlsxwriter.Workbook(self.buffer, {'constant_memory': True, 'strings_to_urls': False})
+        self.worksheet = self.workbook.add_worksheet('Sheet1')
+        self.link_format = self.workbook.add_format({'font_color': '#0563C1', 'underline': 1})
+        header_format = self.workbook.add_format({
+            'font_name': 'Calibri', 'font_size': 11, 'bold': True, 'font_color': '#FFFFFF',
+            'bg_color': '#36454F', # Charcoal/Dark Blue-ish
+            'align': 'center', 'valign': 'vcenter'
+        })
+        
+        # Rename columns for better readability (e.g., phone_number -> Phone Number)
+        headers = [f.replace('_', ' ').title() for f in self.fields]
+        self.worksheet.write_row(0, 0, headers, header_format)
+        self.widths = [len(h) for h in headers]
+        self.link_cols = [i for i, f in enumerate(self.fields) if f in self.LINK_FIELDS]
+        self.row_count = 0
+        self.data = None
+
+    def add_row(self, row: dict):
+        self.row_count += 1
+        values = [row.get(f) for f in self.fields]
+        self.worksheet.write_row(self.row_count, 0, values)
+        
+        # Make links clickable
+        for i in self.link_cols:
+            val = values[i]
+            if isinstance(val, str) and val.startswith(self.LINK_PREFIXES):
+                self.worksheet.write_url(self.row_count, i, val, self.link_format)
+        
+        # Track column widths as rows arrive
+        for i, val in enumerate(values):
+            if val is not None:
+                self.widths[i] = max(self.widths[i], len(str(val)))
+
+    def close(self) -> bytes:
+        """
+        Finalizes the workbook (once) and returns the .xlsx bytes.
+        """
+        if self.data is None:
+            for i, width in enumerate(self.widths):
+                # Cap width at 50 to prevent massive columns
+                self.worksheet.set_column(i, i, min(width + 2, 50))
+            self.workbook.close()
+            self.data = self.buffer.getvalue()
+        return self.data
+
+# Styling for the live preview table. Sent once per full run instead of with every
+# fragment tick, so the 1 s refresh only carries the table itself.
+PREVIEW_TABLE_CSS = """
+<style>
+.dataframe {
+    font-family: sans-serif;
+    border-collapse: collapse;
+    width: 100%;
+    background-color: #000000;
+    color: #ffffff;
+    font-size: 12px;
+}
+.dataframe td, .dataframe th {
+    border: 1px solid #444;
+    padding: 4px 6px;
+    white-space: nowrap;
+    overflow: hidden;
+    text-overflow: ellipsis;
+    max-width: 200px;
+}
+.dataframe tr:nth-child(even) {background-color: #111;}
+.dataframe tr:hover {background-color: #222;}
+.dataframe th {
+    padding-top: 8px;
+    padding-bottom: 8px;
+    text-align: left;
+    background-color: #333;
+    color: white;
+}
+</style>
+"""
+
+PREVIEW_COLUMNS = ("name", "address", "website", "phone_number", "instagram", "reviews_count")
+
+def build_preview_html(rows):
+    """
+    Renders the live preview rows as a static HTML table.
+    st.dataframe is avoided on purpose: it crashes on Streamlit Cloud + Python 3.13
+    (Arrow/LargeUtf8 errors on the frontend).
+    """
+    # Built by hand: ten short rows don't warrant a DataFrame round trip.
+    # Styles come from PREVIEW_TABLE_CSS
+    header = "".join(f"<th>{col}</th>" for col in PREVIEW_COLUMNS)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{escape(str(row[col]))}</td>" for col in PREVIEW_COLUMNS) + "</tr>"
+        for row in rows
+    )
+    html = f"""
+<h3>Live Preview (Last 10 results)</h3>
+<table class="dataframe">
+<thead><tr>{header}</tr></thead>
+<tbody>{body}</tbody>
+</table>
+"""
+    return html
 
 # Set background
 bg_file = '466671893_2003287556785626_5199121047811111781_n.jpg'
@@ -232,15 +440,12 @@ st.title("🚀 Beyond Ads Scraper")
 # -------------------------------------------------------
 # Input Section
 # -------------------------------------------------------
-AREAS = [
-    "Beirut", "Tripoli", "Sidon (Saida)", "Tyre (Sour)", "Jounieh", "Zahle", 
-    "Nabatieh", "Baalbek", "Byblos (Jbeil)", "Batroun", "Aley", "Bhamdoun", "Broummana"
-]
-INDUSTRIES = [
+# Tuple of literals is a code constant, so reruns don't rebuild it.
+INDUSTRIES = (
     "Real Estate Companies", "Roofing Contractors", "Dentists", "Restaurants", 
     "Law Firms", "Hotels", "Hospitals", "Supermarkets", "Pharmacies", 
     "Schools", "Universities", "Gyms", "Car Rental", "Travel Agencies", "Banks", "Travel Agency"
-]
+)
 
 # Only show inputs if not currently running to prevent changing params mid-scrape
 main_placeholder = st.empty()
@@ -263,47 +468,38 @@ if not st.session_state.is_scraping and not st.session_state.results:
             st.session_state.results = []
             st.session_state.start_time = time.time()
             st.session_state.total_target = total_results
+            st.session_state.preview_len = None
             
             # Filter logic
-            strict_area_filter = None
-            excluded_areas_list = []
-            if "(" in area_input:
-                strict_area_filter = area_input.split("(")[0].strip()
-            else:
-                strict_area_filter = area_input
-            
-            # Prepare Allowed Areas (Main Area + Sub Areas)
-            allowed_areas_list = [strict_area_filter]
-            if strict_area_filter in AREA_MAPPINGS:
-                allowed_areas_list.extend(AREA_MAPPINGS[strict_area_filter])
-            
-            for area in AREAS:
-                clean_area = area.split("(")[0].strip()
-                if clean_area.lower() != strict_area_filter.lower():
-                    excluded_areas_list.append(clean_area)
+            strict_area_filter = area_input.split("(")[0].strip()
+            allowed_areas_list = ALLOWED_BY_AREA[strict_area_filter]
+            excluded_areas_list = EXCLUDED_BY_AREA[strict_area_filter]
 
             # Start Scraper
             st.session_state.stop_event = threading.Event()
-            st.session_state.results = []
+            # Bounded at the target: the worker never needs more, and the cap protects memory
+            st.session_state.results = deque(maxlen=total_results)
+            st.session_state.results_lock = threading.Lock()
+            st.session_state.excel_export = LiveExcelExport(PLACE_FIELDS)
             st.session_state.status_dict = {"text": "Starting...", "error": False}
             
-            # Start background thread
-            st.session_state.scraper_thread = threading.Thread(
-                target=run_scraper_thread,
-                args=(
+            # Hand the search to the session's background scraper thread
+            st.session_state.scrape_done = threading.Event()
+            submit_scrape_job(
+                (
                     st.session_state.search_query, 
                     total_results, 
                     strict_area_filter, 
                     excluded_areas_list,
                     allowed_areas_list,
                     st.session_state.results,
+                    st.session_state.results_lock,
+                    st.session_state.excel_export,
                     st.session_state.stop_event,
                     st.session_state.status_dict
-                )
+                ),
+                st.session_state.scrape_done
             )
-            # Daemon thread ensures it dies if main process dies
-            st.session_state.scraper_thread.daemon = True 
-            st.session_state.scraper_thread.start()
             
             st.session_state.is_scraping = True
             main_placeholder.empty() # Clear the form
@@ -311,26 +507,24 @@ if not st.session_state.is_scraping and not st.session_state.results:
 # -------------------------------------------------------
 # Progress & Results Section
 # -------------------------------------------------------
-if st.session_state.is_scraping or st.session_state.results:
+if st.session_state.is_scraping or st.session_state.results or st.session_state.status_dict.get("error"):
     st.info(f"Target: **{st.session_state.search_query}**")
-    
-    # Placeholders for dynamic content
-    progress_bar = st.progress(0)
-    metrics_placeholder = st.empty()
-    status_placeholder = st.empty()
-    dataframe_placeholder = st.empty()
+    st.markdown(PREVIEW_TABLE_CSS, unsafe_allow_html=True)
     
     def render_metrics():
-        results = st.session_state.get("results", [])
-        current_count = len(results)
+        # Snapshot what is needed under the lock the scraper thread appends with
+        with st.session_state.results_lock:
+            results = st.session_state.get("results", [])
+            current_count = len(results)
+            tail = list(islice(reversed(results), 10))[::-1]
         target = st.session_state.total_target if 'total_target' in st.session_state else 1
         
         # Update Progress
         progress = min(int((current_count / target) * 100), 100)
-        progress_bar.progress(progress)
+        st.progress(progress)
         
         # Update Metrics
-        m1, m2, m3 = metrics_placeholder.columns(3)
+        m1, m2, m3 = st.columns(3)
         m1.metric("Found", f"{current_count} / {target}")
         
         elapsed = time.time() - st.session_state.start_time
@@ -342,191 +536,81 @@ if st.session_state.is_scraping or st.session_state.results:
         
         m3.metric("Status", status_msg)
         
-        # Update DataFrame
-        if results:
-            df = pd.DataFrame(results)
-            drop_cols = ["store_shipping", "in_store_pickup"]
-            df = df.drop(columns=[c for c in drop_cols if c in df.columns], errors='ignore')
-            
-            # Sanitize DataFrame for Streamlit
-            # We convert to string to ensure compatibility
-            df = df.astype(str)
-            
-            # Use st.table (static HTML) for the last few rows to avoid Arrow/LargeUtf8 errors on frontend
-            # This is a robust fallback since st.dataframe is crashing on Streamlit Cloud + Python 3.13
-            try:
-                # Show summary metric
-                # Display only the last 10 results in a static HTML table to prevent crashes
-                if len(df) > 0:
-                    preview_cols = ["name", "address", "website", "phone_number", "instagram", "reviews_count"]
-                    # Filter columns that exist in df
-                    cols_to_show = [c for c in preview_cols if c in df.columns]
-                    # If we have matches, use them, otherwise show all
-                    if cols_to_show:
-                        preview_df = df[cols_to_show].tail(10)
-                    else:
-                        preview_df = df.tail(10)
-
-                    # Convert to HTML to avoid Arrow serialization entirely
-                    html = preview_df.to_html(classes='dataframe', index=False)
-                    # Add custom CSS to make it look decent
-                    html = f"""
-<style>
-.dataframe {{
-    font-family: sans-serif;
-    border-collapse: collapse;
-    width: 100%;
-    background-color: #000000;
-    color: #ffffff;
-    font-size: 12px;
-}}
-.dataframe td, .dataframe th {{
-    border: 1px solid #444;
-    padding: 4px 6px;
-    white-space: nowrap;
-    overflow: hidden;
-    text-overflow: ellipsis;
-    max-width: 200px;
-}}
-.dataframe tr:nth-child(even) {{background-color: #111;}}
-.dataframe tr:hover {{background-color: #222;}}
-.dataframe th {{
-    padding-top: 8px;
-    padding-bottom: 8px;
-    text-align: left;
-    background-color: #333;
-    color: white;
-}}
-</style>
-<h3>Live Preview (Last 10 results)</h3>
-{html}
-"""
-                    dataframe_placeholder.markdown(html, unsafe_allow_html=True)
-            except Exception as e:
-                status_placeholder.warning(f"Could not render data table: {e}")
-                
-            return df
-        return None
-
-    # Initial Render
-    df = render_metrics()
+        # Live preview of the last 10 results; the HTML is only rebuilt when new rows arrived
+        if tail:
+            if st.session_state.get("preview_len") != current_count:
+                st.session_state.preview_len = current_count
+                try:
+                    st.session_state.preview_html = build_preview_html(tail)
+                except Exception as e:
+                    st.session_state.preview_html = None
+                    st.warning(f"Could not render data table: {e}")
+            if st.session_state.get("preview_html"):
+                st.markdown(st.session_state.preview_html, unsafe_allow_html=True)
     
-    # Scraping Loop (Blocking UI Update)
     if st.session_state.is_scraping:
-        # Safety check: Ensure scraper_thread exists
-        if "scraper_thread" not in st.session_state or st.session_state.scraper_thread is None:
-            st.warning("Scraping state mismatch (Thread missing). Resetting.")
+        # Safety check: Ensure a scrape was actually submitted
+        if "scrape_done" not in st.session_state or st.session_state.scrape_done is None:
+            st.warning("Scraping state mismatch (Job missing). Resetting.")
             st.session_state.is_scraping = False
             st.session_state.stop_event = None
             try:
                 st.rerun()
             except AttributeError:
                 st.experimental_rerun()
-            except Exception:
-                pass
             st.stop()
 
-        stop_btn_placeholder = st.empty()
-        if stop_btn_placeholder.button("⏹️ Stop Scraping (Hold to Stop)", type="primary"):
+        # Only this block reruns every second while the thread works; the background
+        # CSS, the form and the export section are not re-executed on each tick
+        @st.fragment(run_every=1)
+        def live_progress():
+            scrape_done = st.session_state.get("scrape_done")
+            if scrape_done is None or scrape_done.is_set():
+                # Search finished: rerun the whole app to show the final state and download
+                st.session_state.is_scraping = False
+                st.rerun()
+            
+            render_metrics()
+            
+            # Update detailed status
+            with st.session_state.results_lock:
+                status_text = st.session_state.status_dict["text"]
+            if st.session_state.stop_event.is_set():
+                # The worker finishes its current listing first; this fragment keeps
+                # polling and shows the download once it is really done
+                st.info("Stopping... finishing the current listing.")
+            elif status_text:
+                st.info(status_text)
+        
+        live_progress()
+
+        if not st.session_state.stop_event.is_set() and st.button("⏹️ Stop Scraping (Hold to Stop)", type="primary"):
             st.session_state.stop_event.set()
-            st.session_state.is_scraping = False
             try:
                 st.rerun()
             except AttributeError:
                 st.experimental_rerun()
-            except Exception:
-                pass
-
-        # Robust loop with safety check
-        while st.session_state.get("scraper_thread") and st.session_state.scraper_thread.is_alive():
-            render_metrics()
-            
-            # Update detailed status
-            if st.session_state.status_dict["text"]:
-                status_placeholder.info(st.session_state.status_dict["text"])
-            
-            if st.session_state.status_dict["error"]:
-                 st.error(st.session_state.status_dict["text"])
-                 st.session_state.is_scraping = False
-                 break
-                 
-            time.sleep(1)
-            
-        # Thread finished
-        st.session_state.is_scraping = False
+    else:
         render_metrics()
         
         if st.session_state.status_dict["error"]:
              st.error(f"Scraping failed: {st.session_state.status_dict['text']}")
         else:
              st.success("Scraping finished!")
-             
-        if 'stop_btn_placeholder' in locals():
-            stop_btn_placeholder.empty()
 
-    # Download & New Search (Only when finished)
+    # Download & New Search (Only when finished). is_scraping only turns False once
+    # scrape_done is set, so the workbook has been closed by the worker by now
     if not st.session_state.is_scraping and st.session_state.results:
-        df = pd.DataFrame(st.session_state.results)
-        # Re-clean for download
-        drop_cols = ["store_shipping", "in_store_pickup"]
-        df = df.drop(columns=[c for c in drop_cols if c in df.columns], errors='ignore')
-        
-        # Rename columns for better readability (e.g., phone_number -> Phone Number)
-        df.columns = [c.replace('_', ' ').title() for c in df.columns]
-        
-        # Generate Excel
-        safe_name = st.session_state.search_query.replace(" ", "_").replace(",", "").replace("/", "-")
-        filename = f"Scrape_{safe_name}_{len(df)}.xlsx"
+        excel_export = st.session_state.excel_export
         
-        buffer = io.BytesIO()
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Sheet1')
-            
-            # Access the worksheet
-            worksheet = writer.sheets['Sheet1']
-            
-            # Styles
-            blue_font = Font(color="0563C1", underline="single")
-            header_font = Font(name='Calibri', size=11, bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="36454F", end_color="36454F", fill_type="solid") # Charcoal/Dark Blue-ish
-            center_align = Alignment(horizontal='center', vertical='center')
-            
-            # Apply Header Styles
-            for cell in worksheet[1]:
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = center_align
-            
-            # Auto-adjust column widths
-            for i, col in enumerate(df.columns):
-                max_len = 0
-                if col: max_len = len(str(col))
-                for val in df[col]:
-                    if val is not None: max_len = max(max_len, len(str(val)))
-                # Cap width at 50 to prevent massive columns
-                adjusted_width = min(max_len + 2, 50) 
-                col_letter = get_column_letter(i + 1)
-                worksheet.column_dimensions[col_letter].width = adjusted_width
-
-            # Make links clickable
-            cols_to_link = []
-            # Check for title-cased column names
-            if 'Website' in df.columns: cols_to_link.append(df.columns.get_loc('Website') + 1)
-            if 'Instagram' in df.columns: cols_to_link.append(df.columns.get_loc('Instagram') + 1)
-                
-            for col_idx in cols_to_link:
-                for row_idx in range(2, len(df) + 2):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    val = cell.value
-                    if val and isinstance(val, str) and val.startswith("http"):
-                        cell.hyperlink = val
-                        cell.font = blue_font
+        safe_name = st.session_state.search_query.translate(SAFE_FILENAME_TABLE)
+        filename = f"Scrape_{safe_name}_{excel_export.row_count}.xlsx"
 
         col_dl, col_new = st.columns([2, 1])
         with col_dl:
             st.download_button(
                 label="📥 Download Excel Results",
-                data=buffer.getvalue(),
+                data=excel_export.data,
                 file_name=filename,
                 mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
                 use_container_width=True
@@ -536,5 +620,7 @@ if st.session_state.is_scraping or st.session_state.results:
                 st.session_state.results = []
                 st.session_state.search_query = ""
                 st.session_state.is_scraping = False
-                try: st.rerun()
-                except: pass
+                try:
+                    st.rerun()
+                except AttributeError:
+                    st.experimental_rerun()
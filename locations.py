@@ -125,3 +125,20 @@ AREA_MAPPINGS = {
         "Fanar" 
     ] 
  }
+
+AREAS = (
+    "Beirut", "Tripoli", "Sidon (Saida)", "Tyre (Sour)", "Jounieh", "Zahle", 
+    "Nabatieh", "Baalbek", "Byblos (Jbeil)", "Batroun", "Aley", "Bhamdoun", "Broummana"
+)
+
+# Area filters depend only on the selected area, so they are built once per process
+# (this module is imported once, unlike app.py which reruns on every interaction).
+# "Sidon (Saida)" -> "Sidon"
+CLEAN_AREAS = tuple(a.split("(")[0].strip() for a in AREAS)
+# Main area + its sub-areas/neighborhoods
+ALLOWED_BY_AREA = {clean: (clean, *AREA_MAPPINGS.get(clean, ())) for clean in CLEAN_AREAS}
+# Every other main area
+EXCLUDED_BY_AREA = {
+    clean: tuple(other for other in CLEAN_AREAS if other.lower() != clean.lower())
+    for clean in CLEAN_AREAS
+}
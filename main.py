@@ -3,17 +3,43 @@ import os
 import re
 import urllib.parse
 import platform
-import time
+import asyncio
 import argparse
 import random
 import sys
 import subprocess
+import csv
+import sqlite3
+import time
+import gzip
+import lzma
 from typing import List, Optional
-from dataclasses import dataclass, asdict
-from playwright.sync_api import sync_playwright, Page, TimeoutError, BrowserContext
-import pandas as pd
+from functools import lru_cache, partial
+from dataclasses import dataclass, fields
+from playwright.async_api import async_playwright, Page, TimeoutError, Browser, BrowserContext, Playwright
+
+# Result links in the Google Maps side panel (CSS, so lookups use the browser's native querySelectorAll)
+LISTINGS_SELECTOR = 'a[href*="https://www.google.com/maps/place"]'
+# Feature id (!1s0x...:0x...) in a listing href; stays the same when the rest of the URL differs
+PLACE_ID_RE = re.compile(r'!1s([^!?]+)')
+# "You've reached the end of the list." marker under the last result
+END_OF_LIST_SELECTOR = 'span.HlvSq'
+# Details panel of an opened place
+DETAILS_PANEL_SELECTOR = 'div[role="main"]'
+# Any link to an Instagram page
+INSTAGRAM_LINK_SELECTOR = 'a[href*="instagram.com"]'
+# Business name header of a place's details panel
+PLACE_NAME_XPATH = '//div[@class="TIHn2 "]//h1[@class="DUwDvf lfPIob"]'
+# Place pages opened in parallel tabs, and the upper bound accepted from callers
+DETAIL_CONCURRENCY = 5
+MAX_CONCURRENCY = 8
+# Discovered hrefs waiting for a free tab
+LISTING_QUEUE_SIZE = 50
+# Searches scraped at the same time in a multi-query run (each with its own detail tabs)
+QUERY_CONCURRENCY = 3
 
-@dataclass
+# slots: no per-instance __dict__; not frozen because extract_place fills it in step by step
+@dataclass(slots=True)
 class Place:
     name: str = ""
     address: str = ""
@@ -28,20 +54,40 @@ class Place:
     place_type: str = ""
     opens_at: str = ""
 
+    def to_dict(self) -> dict:
+        """
+        Flat {field: value} dict. Place has no nested values, so this skips the
+        recursive deep copy that dataclasses.asdict() does.
+        """
+        return dict(zip(PLACE_FIELDS, place_row(self)))
+
+PLACE_FIELDS = tuple(f.name for f in fields(Place))
+
+def make_row_getter(names):
+    """
+    Generates `def row(obj): return (obj.a, obj.b, ...)` for a fixed list of attribute names.
+    Plain attribute reads in one function are about twice as fast as attrgetter(*names).
+    """
+    namespace = {}
+    exec(f"def row(obj): return ({''.join(f'obj.{name}, ' for name in names)})", namespace)
+    return namespace["row"]
+
+# Place -> tuple of values in PLACE_FIELDS order
+place_row = make_row_getter(PLACE_FIELDS)
+
 def setup_logging():
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s',
     )
 
-def extract_text(page: Page, xpath: str) -> str:
-    try:
-        if page.locator(xpath).count() > 0:
-            return page.locator(xpath).inner_text()
-    except Exception as e:
-        logging.warning(f"Failed to extract text for xpath {xpath}: {e}")
-    return ""
+# Corporate suffix and anything after it ("X sarl - Beirut" -> "X")
+CORP_SUFFIX_RE = re.compile(r'\s+(sarl|sal|inc|co|company|ltd|llc)\b.*', re.IGNORECASE)
+
+# Common delimiters used to separate name from description, in priority order
+NAME_DELIMITERS = (':', '|', '–', ' - ', '•', ',', '.')
 
+@lru_cache(maxsize=4096)
 def clean_business_name(name: str) -> str:
     """
     Cleans business name by removing tagline or description after common delimiters.
@@ -50,22 +96,18 @@ def clean_business_name(name: str) -> str:
     if not name:
         return ""
     
-    # Common delimiters used to separate name from description
-    delimiters = [':', '|', '–', ' - ', '•', ',', '.'] 
-    
     cleaned_name = name
     
-    for char in delimiters:
+    for char in NAME_DELIMITERS:
         if char in name:
-            parts = name.split(char)
-            candidate = parts[0].strip()
+            candidate = name.partition(char)[0].strip()
             # Heuristic: If the first part is substantial (e.g. > 2 chars), use it.
             if len(candidate) > 1:
                 cleaned_name = candidate
                 break
     
     # Remove common corporate suffixes to improve search relevance
-    cleaned_name = re.sub(r'\s+(sarl|sal|inc|co|company|ltd|llc)\b.*', '', cleaned_name, flags=re.IGNORECASE).strip()
+    cleaned_name = CORP_SUFFIX_RE.sub('', cleaned_name).strip()
 
     # Extra cleanup: specific words that might indicate a tagline if no delimiter
     # e.g. "Matar Law Firm - Lawyers in Beirut" -> handled by delimiter
@@ -80,214 +122,365 @@ def clean_business_name(name: str) -> str:
         
     return cleaned_name
 
-def verify_instagram_match(business_name: str, url: str) -> bool:
+# Generic words that would make a business name match unrelated Instagram accounts
+WEAK_TOKENS = frozenset({
+    "lebanon", "lb", "beirut", "company", "co", "ltd", "sarl", "sal", 
+    "agency", "travel", "tourism", "real", "estate", "group", "holding",
+    "shop", "store", "restaurant", "hotel", "cafe", "lounge", "bar",
+    "services", "trading", "contracting", "engineering", "design", "media",
+    "pharma", "pharmacy", "clinic", "dr", "center", "centre", "market",
+    "supermarket", "gym", "spa", "beauty", "salon", "lounge", "boutique",
+    "fashion", "style", "home", "house", "decor", "interiors", "furniture",
+    "kitchen", "bakery", "pastry", "sweets", "roastery", "jewellery", "jewelry",
+    "exchange", "transfer", "money", "bank", "insurance", "law", "legal",
+    "firm", "associates", "consultancy", "consulting", "schools", "school",
+    "university", "college", "academy", "institute", "education", "learning",
+    "nursery", "kids", "child", "care", "health", "medical", "dental",
+    "dentist", "doctor", "physio", "optical", "optics", "vision", "eye",
+    "hospital", "laboratory", "lab", "imaging", "scan", "xray", "auto",
+    "car", "cars", "rental", "rent", "drive", "motors", "motor", "cycle",
+    "bike", "mechanic", "garage", "fix", "repair", "tech", "technology",
+    "solutions", "systems", "soft", "software", "app", "mobile", "phone",
+    "cell", "tel", "telecom", "net", "network", "online", "web", "digital",
+    "marketing", "social", "events", "planning", "wedding", "party",
+    "catering", "food", "drink", "beverage", "snack", "grill", "burger",
+    "pizza", "sushi", "pasta", "seafood", "fish", "meat", "chicken",
+    "taouk", "shawarma", "falafel", "manakish", "lebanese", "cuisine",
+    "international", "diner", "bistro", "pub", "club", "resort", "beach",
+    "pool", "view", "terrace", "garden", "park", "plaza", "mall", "city",
+    "town", "village", "street", "road", "highway", "main", "branch",
+    "holidays", "holiday", "tour", "tours", "trip", "trips", "booking",
+    "reservation", "ticket", "tickets", "visa", "visas", "cargo", "freight",
+    "the", "and", "for", "of", "in", "at", "by", "to"
+})
+
+INSTAGRAM_USER_RE = re.compile(r"instagram\.com/([^/?#]+)")
+NON_ALNUM_SPACE_RE = re.compile(r"[^a-zA-Z0-9\s]")
+NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9]")
+
+# Cached: every candidate link of a place is checked against the same name
+@lru_cache(maxsize=4096)
+def strong_name_tokens(business_name: str) -> tuple:
     """
-    Verifies if the Instagram URL is likely to belong to the business.
+    Returns the distinctive tokens of a business name (empty if it is too generic).
     """
-    if not url or "instagram.com" not in url:
-        return False
-        
-    # Extract username
-    match = re.search(r"instagram\.com/([^/?#]+)", url)
-    if not match:
-        return False
-    
-    username = match.group(1).lower()
-    
     # Normalize business name
     # Replace special chars with SPACE to preserve word boundaries (e.g. "All-ways" -> "All ways")
-    name_clean = re.sub(r"[^a-zA-Z0-9\s]", " ", business_name.lower())
+    name_clean = NON_ALNUM_SPACE_RE.sub(" ", business_name.lower())
     tokens = name_clean.split()
     
     # Filter out weak tokens that might generate false positives
-    weak_tokens = {
-        "lebanon", "lb", "beirut", "company", "co", "ltd", "sarl", "sal", 
-        "agency", "travel", "tourism", "real", "estate", "group", "holding",
-        "shop", "store", "restaurant", "hotel", "cafe", "lounge", "bar",
-        "services", "trading", "contracting", "engineering", "design", "media",
-        "pharma", "pharmacy", "clinic", "dr", "center", "centre", "market",
-        "supermarket", "gym", "spa", "beauty", "salon", "lounge", "boutique",
-        "fashion", "style", "home", "house", "decor", "interiors", "furniture",
-        "kitchen", "bakery", "pastry", "sweets", "roastery", "jewellery", "jewelry",
-        "exchange", "transfer", "money", "bank", "insurance", "law", "legal",
-        "firm", "associates", "consultancy", "consulting", "schools", "school",
-        "university", "college", "academy", "institute", "education", "learning",
-        "nursery", "kids", "child", "care", "health", "medical", "dental",
-        "dentist", "doctor", "physio", "optical", "optics", "vision", "eye",
-        "hospital", "laboratory", "lab", "imaging", "scan", "xray", "auto",
-        "car", "cars", "rental", "rent", "drive", "motors", "motor", "cycle",
-        "bike", "mechanic", "garage", "fix", "repair", "tech", "technology",
-        "solutions", "systems", "soft", "software", "app", "mobile", "phone",
-        "cell", "tel", "telecom", "net", "network", "online", "web", "digital",
-        "marketing", "social", "events", "planning", "wedding", "party",
-        "catering", "food", "drink", "beverage", "snack", "grill", "burger",
-        "pizza", "sushi", "pasta", "seafood", "fish", "meat", "chicken",
-        "taouk", "shawarma", "falafel", "manakish", "lebanese", "cuisine",
-        "international", "diner", "bistro", "pub", "club", "resort", "beach",
-        "pool", "view", "terrace", "garden", "park", "plaza", "mall", "city",
-        "town", "village", "street", "road", "highway", "main", "branch",
-        "holidays", "holiday", "tour", "tours", "trip", "trips", "booking",
-        "reservation", "ticket", "tickets", "visa", "visas", "cargo", "freight",
-        "the", "and", "for", "of", "in", "at", "by", "to"
-    }
-    
-    strong_tokens = [t for t in tokens if t not in weak_tokens and len(t) > 2]
+    strong_tokens = [t for t in tokens if t not in WEAK_TOKENS and len(t) > 2]
     
     # If no strong tokens (e.g. "The Travel Agency"), fall back to checking all tokens but require stricter match
     if not strong_tokens:
         # Fallback: if business name is short but specific (e.g. "ABC Travel")
         # and we stripped "Travel", we might be left with "ABC".
         # If the original token was short but not weak, maybe keep it?
-        strong_tokens = [t for t in tokens if t not in weak_tokens]
+        strong_tokens = [t for t in tokens if t not in WEAK_TOKENS]
+    
+    return tuple(strong_tokens)
+
+def verify_instagram_match(business_name: str, url: str) -> bool:
+    """
+    Verifies if the Instagram URL is likely to belong to the business.
+    """
+    if not url or "instagram.com" not in url:
+        return False
         
+    # Extract username
+    match = INSTAGRAM_USER_RE.search(url)
+    if not match:
+        return False
+    
+    username = match.group(1).lower()
+    
+    strong_tokens = strong_name_tokens(business_name)
     if not strong_tokens:
         return False # Name is too generic
         
     # Check if ANY strong token is present in the username
     # Normalize username to remove dots/underscores for easier matching
     # e.g. "all.ways.travel" -> "allwaystravel"
-    username_clean = re.sub(r"[^a-zA-Z0-9]", "", username)
-    
-    # Improved Check:
-    # 1. Exact match of a strong token
-    # 2. Sequential match of tokens (e.g. "All-ways" -> "all" + "ways" in sequence)
+    username_clean = NON_ALNUM_RE.sub("", username)
     
-    # Concatenate strong tokens to check for full name match
-    strong_concat = "".join(strong_tokens)
-    if strong_concat in username_clean:
-        return True
+    # A strong token anywhere in the username is a match (e.g. "pbm" in "pbmrealestate").
+    # This also covers the full-name match: if the concatenated tokens are in the
+    # username, so is the first token.
+    # Substring rather than set intersection: usernames are usually glued words.
+    return any(token in username_clean for token in strong_tokens)
+
+# Search-engine redirects, trackers and result pages that merely mention instagram.com,
+# as one alternation so each href is scanned once
+SEARCH_NOISE_RE = re.compile(r"google\.com|bing\.com|microsoft\.com|duckduckgo\.com|yahoo\.com|search\.yahoo|brave\.com|/search|/url\?|y\.gif")
+# Posts, reels, explore and tag pages are not profiles
+NON_PROFILE_RE = re.compile(r"/p/|/reel/|/explore/|/tags/")
+
+SEARCH_ENGINE_URLS = {
+    "yahoo": "https://search.yahoo.com/search?p={}",
+    "brave": "https://search.brave.com/search?q={}",
+}
+# Fallback queries in priority order: Yahoo is generally less strict, Brave is a good alternative.
+# Bing is left out: it blocks these requests, and its query always repeated Brave's.
+FALLBACK_QUERIES = (
+    ("{name} {address} instagram", "yahoo"),
+    ("{name} Lebanon instagram", "yahoo"),
+    ("{name} instagram", "brave"),
+)
+
+# hrefs of the visible elements, with the same visibility rule as Playwright's is_visible()
+VISIBLE_HREFS_JS = """
+els => els.filter(el => {
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== "hidden";
+}).map(el => el.getAttribute("href"))
+"""
+
+# Minimum spacing between two requests to the same engine, across all listings and tabs (±10% jitter)
+ENGINE_REQUEST_INTERVAL = 1.5
+# Monotonic time at which each engine's next request may go out
+ENGINE_NEXT_REQUEST = {}
+
+async def pace_engine(engine: str):
+    """
+    Waits for this engine's next free request slot. Engines are paced separately so they still run in parallel.
+    """
+    now = time.monotonic()
+    previous = ENGINE_NEXT_REQUEST.get(engine, 0.0)
+    start = max(now, previous)
+    # Reserve the slot before sleeping so concurrent searches queue up behind each other
+    reserved = start + ENGINE_REQUEST_INTERVAL * random.uniform(0.9, 1.1)
+    ENGINE_NEXT_REQUEST[engine] = reserved
+    if start > now:
+        try:
+            await asyncio.sleep(start - now)
+        except asyncio.CancelledError:
+            # Cancelled before its request went out (e.g. the other engine found the profile):
+            # hand the slot back, unless another search has already queued behind it
+            if ENGINE_NEXT_REQUEST.get(engine) == reserved:
+                ENGINE_NEXT_REQUEST[engine] = previous
+            raise
+
+async def search_engine_for_instagram(page: Page, engine: str, queries: List[str], name: str, should_stop_callback=None) -> Optional[str]:
+    """
+    Runs one engine's fallback queries in order on `page`, returning the first matching profile.
+    Returns "" only if every query got a result page; None if one failed or a stop cut them short.
+    """
+    complete = True
+    for query in queries:
+        # Space out requests to the engine, including ones made by other listings' tabs
+        await pace_engine(engine)
+        if should_stop_callback and should_stop_callback():
+            logging.info("Stopping fallback search due to user interrupt.")
+            complete = False
+            break
+
+        logging.info("Fallback Search (%s): %s", engine, query)
         
-    # Check individual strong tokens
-    for token in strong_tokens:
-        if token in username_clean:
-            # If the token is very short (3 chars), ensure it's not part of a common suffix?
-            # But for now, trust the strong list.
-            return True
+        try:
+            search_url = SEARCH_ENGINE_URLS[engine].format(urllib.parse.quote(query))
+            await page.goto(search_url, timeout=15000)
+
+            # Yahoo Consent
+            if engine == "yahoo":
+                try:
+                    agree_button = page.locator('button[name="agree"]')
+                    if await agree_button.is_visible():
+                         await agree_button.click()
+                except Exception: pass
+
+            # Direct Search for Instagram links
+            # Wait briefly for results to populate (this also covers the consent redirect)
+            try:
+                await page.wait_for_selector(INSTAGRAM_LINK_SELECTOR, timeout=3000)
+            except Exception:
+                pass 
+            
+            # All visible result hrefs in one round trip instead of two calls per link
+            hrefs = await page.locator(INSTAGRAM_LINK_SELECTOR).evaluate_all(VISIBLE_HREFS_JS)
             
-    return False
+            # Result pages repeat a link (title, URL line, sitelinks); check each one once
+            for href in dict.fromkeys(hrefs):
+                if "instagram.com" in href:
+                     # Filter noise
+                     if SEARCH_NOISE_RE.search(href):
+                         continue
+                         
+                     # Validate profile
+                     if not NON_PROFILE_RE.search(href):
+                         # Ensure it's not just the root domain
+                         if href.strip('/').endswith("instagram.com"):
+                             continue
+                             
+                         # Verify match
+                         if not verify_instagram_match(name, href):
+                             logging.info("Rejected mismatching Instagram: %s for %s", href, name)
+                             continue
 
-def search_web_for_instagram(context: BrowserContext, name: str, address: str, should_stop_callback=None) -> str:
+                         logging.info("Found Instagram via %s: %s", engine, href)
+                         return href
+        
+        except Exception as e:
+            logging.warning("%s search error for '%s': %s", engine, query, e)
+            complete = False
+    return "" if complete else None
+
+async def search_web_for_instagram(page: Page, name: str, address: str, should_stop_callback=None) -> Optional[str]:
     """
     Robust fallback search using Yahoo and Brave.
     Bing and DuckDuckGo are currently blocking requests.
+    Engines are searched in parallel (the first on `page`, so pass a tab whose content is
+    no longer needed); the first matching profile wins and the other searches are cancelled.
+    Returns "" when an engine searched without finding one, None when no engine got through
+    (blocked, timed out or stopped), so the caller can tell "no profile" from "no answer".
     """
     if should_stop_callback and should_stop_callback():
-        return ""
+        return None
 
-    page = context.new_page()
-    found_link = ""
-    
+    extra_pages = []
+    searches = set()
+    result = None
     try:
         clean_name = clean_business_name(name)
         
-        # Priority 1: Yahoo Search - Generally less strict
-        # Priority 2: Brave Search - Good alternative
-        # Priority 3: Bing - Backup (High block rate)
-        
-        queries = [
-            (f"{clean_name} {address} instagram", "yahoo"),
-            (f"{clean_name} Lebanon instagram", "yahoo"),
-            (f"{clean_name} instagram", "brave"),
-            (f"{clean_name} instagram", "bing")
-        ]
-        
-        # Deduplicate based on query string
-        unique_queries = []
-        seen = set()
-        for q, engine in queries:
-            if q not in seen:
-                unique_queries.append((q, engine))
-                seen.add(q)
-        
-        for query, engine in unique_queries:
-            if should_stop_callback and should_stop_callback():
-                logging.info("Stopping fallback search due to user interrupt.")
-                break
-
-            # Add random delay to look human
-            sleep_time = random.uniform(2.0, 5.0)
-            # logging.info(f"Sleeping {sleep_time:.2f}s before {engine} search...")
-            time.sleep(sleep_time)
+        # Each engine's queries in priority order. Identical queries (e.g. when the
+        # address is just "Lebanon") are only sent once
+        queries_by_engine = {}
+        for template, engine in FALLBACK_QUERIES:
+            queries = queries_by_engine.setdefault(engine, [])
+            query = template.format(name=clean_name, address=address)
+            if query not in queries:
+                queries.append(query)
 
-            logging.info(f"Fallback Search ({engine}): {query}")
-            
-            try:
-                encoded_query = urllib.parse.quote(query)
-                search_url = ""
-                
-                if engine == "bing":
-                    search_url = f"https://www.bing.com/search?q={encoded_query}"
-                elif engine == "yahoo":
-                    search_url = f"https://search.yahoo.com/search?p={encoded_query}"
-                elif engine == "brave":
-                    search_url = f"https://search.brave.com/search?q={encoded_query}"
-                
-                page.goto(search_url, timeout=15000)
-                page.wait_for_timeout(2000)
-
-                # Yahoo Consent
-                if engine == "yahoo":
-                    try:
-                        if page.locator('button[name="agree"]').is_visible():
-                             page.locator('button[name="agree"]').click()
-                             page.wait_for_timeout(1000)
-                    except: pass
-                
-                # Bing Consent
-                if engine == "bing":
-                    try:
-                        if page.locator('#bnp_btn_accept').is_visible():
-                            page.locator('#bnp_btn_accept').click()
-                            page.wait_for_timeout(1000)
-                    except: pass
+        for engine, queries in queries_by_engine.items():
+            if searches:
+                extra_pages.append(await new_blocking_page(page.context))
+            engine_page = extra_pages[-1] if extra_pages else page
+            searches.add(asyncio.create_task(
+                search_engine_for_instagram(engine_page, engine, queries, name, should_stop_callback)
+            ))
 
-                # Direct Search for Instagram links
-                # Wait briefly for results to populate
-                try:
-                    page.wait_for_selector('a[href*="instagram.com"]', timeout=3000)
-                except:
-                    pass 
-                
-                links = page.locator('a[href*="instagram.com"]').all()
-                
-                for link in links:
-                    if not link.is_visible():
-                        continue
-                    
-                    href = link.get_attribute('href')
-                    if not href:
-                        continue
-                    
-                    if "instagram.com" in href:
-                         # Filter noise
-                         if any(x in href for x in ["google.com", "bing.com", "microsoft.com", "duckduckgo.com", "yahoo.com", "search.yahoo", "brave.com", "/search", "/url?", "y.gif"]):
-                             continue
-                             
-                         # Validate profile
-                         if "/p/" not in href and "/reel/" not in href and "/explore/" not in href and "/tags/" not in href:
-                             # Ensure it's not just the root domain
-                             if href.strip('/').endswith("instagram.com"):
-                                 continue
-                                 
-                             # Verify match
-                             if not verify_instagram_match(name, href):
-                                 logging.info(f"Rejected mismatching Instagram: {href} for {name}")
-                                 continue
-
-                             found_link = href
-                             logging.info(f"Found Instagram via {engine}: {found_link}")
-                             return found_link
-            
-            except Exception as e:
-                logging.warning(f"{engine} search error for '{query}': {e}")
+        while searches:
+            finished, searches = await asyncio.wait(searches, return_when=asyncio.FIRST_COMPLETED)
+            for search in finished:
+                if search.cancelled() or search.exception() is not None or search.result() is None:
+                    continue
+                if search.result():
+                    return search.result()
+                result = ""
             
     except Exception as e:
-        logging.warning(f"Search failed for {name}: {e}")
+        logging.warning("Search failed for %s: %s", name, e)
     finally:
-        page.close()
+        for search in searches:
+            search.cancel()
+        await asyncio.gather(*searches, return_exceptions=True)
+        for extra_page in extra_pages:
+            try:
+                await extra_page.close()
+            except Exception:
+                pass
     
-    return found_link
+    return result
+
+# Fallback search results by (business name, last address part), "" when nothing was found.
+# Listings of one business (e.g. a chain in several suburbs) then share a single search.
+INSTAGRAM_SEARCH_CACHE = {}
+INSTAGRAM_SEARCH_CACHE_SIZE = 1024
+# Searches still running in some tab, so a second listing waits for them instead of repeating them
+INSTAGRAM_SEARCHES_PENDING = {}
+# On-disk copy of the results, so a later run over the same area skips the searches.
+# Misses expire sooner: a business may open an Instagram account in the meantime
+INSTAGRAM_DISK_CACHE_PATH = ".ig_cache.sqlite"
+INSTAGRAM_DISK_CACHE_TTL = 30 * 24 * 3600
+INSTAGRAM_DISK_CACHE_MISS_TTL = 7 * 24 * 3600
+instagram_disk_cache = None
+
+def open_instagram_disk_cache():
+    global instagram_disk_cache
+    if instagram_disk_cache is None:
+        instagram_disk_cache = sqlite3.connect(INSTAGRAM_DISK_CACHE_PATH, check_same_thread=False)
+        instagram_disk_cache.execute(
+            "CREATE TABLE IF NOT EXISTS instagram (name TEXT, region TEXT, url TEXT, ts INTEGER, PRIMARY KEY (name, region))"
+        )
+    return instagram_disk_cache
 
+def load_cached_instagram(key) -> Optional[str]:
+    """
+    Returns the stored search result for `key` if it is still fresh, else None.
+    """
+    try:
+        row = open_instagram_disk_cache().execute(
+            "SELECT url, ts FROM instagram WHERE name = ? AND region = ?", key
+        ).fetchone()
+    except sqlite3.Error as e:
+        logging.warning("Instagram cache read failed: %s", e)
+        return None
+    if row is None:
+        return None
+    url, ts = row
+    ttl = INSTAGRAM_DISK_CACHE_TTL if url else INSTAGRAM_DISK_CACHE_MISS_TTL
+    return url if time.time() - ts < ttl else None
+
+def store_cached_instagram(key, url: str):
+    try:
+        with open_instagram_disk_cache() as db:
+            db.execute("INSERT OR REPLACE INTO instagram VALUES (?, ?, ?, ?)", (*key, url, int(time.time())))
+    except sqlite3.Error as e:
+        logging.warning("Instagram cache write failed: %s", e)
+
+async def search_web_for_instagram_cached(page: Page, name: str, address: str, should_stop_callback=None) -> str:
+    """
+    search_web_for_instagram() with results shared between listings of the same business.
+    """
+    if should_stop_callback and should_stop_callback():
+        return ""
+    key = (name.strip().casefold(), address.rpartition(",")[2].strip().casefold())
+    if key in INSTAGRAM_SEARCH_CACHE:
+        logging.info("Reusing fallback search result for %s", name)
+        return INSTAGRAM_SEARCH_CACHE[key]
+    stored = load_cached_instagram(key)
+    if stored is not None:
+        logging.info("Reusing stored fallback search result for %s", name)
+        return stored
+
+    loop = asyncio.get_running_loop()
+    pending = INSTAGRAM_SEARCHES_PENDING.get(key)
+    if pending is not None and pending.get_loop() is loop:
+        # shield: cancelling this listing must not cancel the other tab's search
+        return await asyncio.shield(pending)
+
+    future = loop.create_future()
+    INSTAGRAM_SEARCHES_PENDING[key] = future
+    link = None
+    try:
+        link = await search_web_for_instagram(page, name, address, should_stop_callback)
+        # None (every engine failed) or a search cut short by a stop request is not a real "not found"
+        if link is not None and not (should_stop_callback and should_stop_callback()):
+            if len(INSTAGRAM_SEARCH_CACHE) >= INSTAGRAM_SEARCH_CACHE_SIZE:
+                # Dicts keep insertion order, so this drops the oldest entry
+                del INSTAGRAM_SEARCH_CACHE[next(iter(INSTAGRAM_SEARCH_CACHE))]
+            INSTAGRAM_SEARCH_CACHE[key] = link
+            store_cached_instagram(key, link)
+    finally:
+        if INSTAGRAM_SEARCHES_PENDING.get(key) is future:
+            del INSTAGRAM_SEARCHES_PENDING[key]
+        future.set_result(link or "")
+    return link or ""
+
+NON_DIGIT_RE = re.compile(r'\D')
+MOBILE_PREFIXES = frozenset(('03', '70', '71', '76', '78', '79', '81'))
+LANDLINE_PREFIXES = frozenset(('01', '04', '05', '06', '07', '08', '09'))
+# Leading digit of a landline number written without its 0
+LANDLINE_7DIGIT_HEADS = frozenset('1456789')
+# Phone type by leading digit (7-digit numbers missing their 0) or by 2-digit prefix (8 digits)
+SEVEN_DIGIT_TYPES = {'3': "Mobile", **dict.fromkeys(LANDLINE_7DIGIT_HEADS, "Landline")}
+EIGHT_DIGIT_TYPES = {**dict.fromkeys(MOBILE_PREFIXES, "Mobile"), **dict.fromkeys(LANDLINE_PREFIXES, "Landline")}
+# 800, 888, 877, 866, 855, 844, 833 are US toll-free
+US_TOLL_FREE_CODES = frozenset(('800', '888', '877', '866', '855', '844', '833'))
+
+# Chains often share one central number; results are immutable tuples, so caching is safe
+@lru_cache(maxsize=4096)
 def validate_lebanese_phone(phone_raw: str):
     """
     Validates and cleans a Lebanese phone number.
@@ -297,7 +490,7 @@ def validate_lebanese_phone(phone_raw: str):
         return "", "Missing", False
         
     # Remove non-digits
-    digits = re.sub(r'\D', '', phone_raw)
+    digits = NON_DIGIT_RE.sub('', phone_raw)
     
     # Handle country code
     if digits.startswith('961'):
@@ -318,145 +511,193 @@ def validate_lebanese_phone(phone_raw: str):
         return digits, "International/Invalid", False
     
     # Also reject US toll-free area codes if they slipped through
-    # 800, 888, 877, 866, 855, 844, 833 are US toll-free
-    if len(digits) == 10 and digits[:3] in ['800', '888', '877', '866', '855', '844', '833']:
+    if len(digits) == 10 and digits[:3] in US_TOLL_FREE_CODES:
         return digits, "International/Invalid", False
 
     # Case 1: 7 digits (e.g. 3xxxxxx or 1xxxxxx for Beirut landline without 0)
+    # Note: 7 is usually 70/71 mobile, but 07 is south landline.
+    # 7xxxxxx is ambiguous without context, but usually 03 is the only 7-digit mobile widely used without 0.
+    # Actually, 70/71 are 8 digits: 70xxxxxx.
+    # So if it starts with 7 and is 7 digits, it might be 07 landline?
     if len(digits) == 7:
-        if digits.startswith('3'):
-            return '0' + digits, "Mobile", True
-        elif digits.startswith(('1', '4', '5', '6', '7', '8', '9')): # Landline area codes
-             # Note: 7 is usually 70/71 mobile, but 07 is south landline. 
-             # 7xxxxxx is ambiguous without context, but usually 03 is the only 7-digit mobile widely used without 0.
-             # Actually, 70/71 are 8 digits: 70xxxxxx.
-             # So if it starts with 7 and is 7 digits, it might be 07 landline?
-             return '0' + digits, "Landline", True
+        phone_type = SEVEN_DIGIT_TYPES.get(digits[0])
+        if phone_type:
+            return '0' + digits, phone_type, True
              
     # Case 2: 8 digits (Standard local format)
     if len(digits) == 8:
-        prefix = digits[:2]
-        if prefix in ['03', '70', '71', '76', '78', '79', '81']:
-            return digits, "Mobile", True
-        elif prefix in ['01', '04', '05', '06', '07', '08', '09']:
-            return digits, "Landline", True
+        phone_type = EIGHT_DIGIT_TYPES.get(digits[:2])
+        if phone_type:
+            return digits, phone_type, True
             
     return digits, "Unknown", False
 
-def extract_place(page: Page, context: BrowserContext = None, should_stop_callback=None) -> Place:
-    # XPaths
-    name_xpath = '//div[@class="TIHn2 "]//h1[@class="DUwDvf lfPIob"]'
-    address_xpath = '//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]'
-    website_xpath = '//a[@data-item-id="authority"]//div[contains(@class, "fontBodyMedium")]'
-    phone_number_xpath = '//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]'
-    reviews_count_xpath = '//div[@class="TIHn2 "]//div[@class="fontBodyMedium dmRWX"]//div//span//span//span[@aria-label]'
-    reviews_average_xpath = '//div[@class="TIHn2 "]//div[@class="fontBodyMedium dmRWX"]//div//span[@aria-hidden]'
-    opens_at_xpath = '//button[contains(@data-item-id, "oh")]//div[contains(@class, "fontBodyMedium")]'
-    opens_at_xpath2 = '//div[@class="MkV9"]//span[@class="ZDu9vd"]//span[2]'
-    place_type_xpath = '//div[@class="LBgpqf"]//button[@class="DkEaL "]'
+# Detail panel fields as (key, xpath, attribute); without an attribute the node's text is read
+PLACE_DETAILS_SPEC = [
+    ("name", PLACE_NAME_XPATH, None),
+    ("address", '//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]', None),
+    ("website_url", '//a[@data-item-id="authority"]', "href"),
+    ("phone_number", '//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]', None),
+    ("reviews_count", '//div[@class="TIHn2 "]//div[@class="fontBodyMedium dmRWX"]//div//span//span//span[@aria-label]', None),
+    ("reviews_average", '//div[@class="TIHn2 "]//div[@class="fontBodyMedium dmRWX"]//div//span[@aria-hidden]', None),
+    ("opens_at", '//button[contains(@data-item-id, "oh")]//div[contains(@class, "fontBodyMedium")]', None),
+    ("opens_at2", '//div[@class="MkV9"]//span[@class="ZDu9vd"]//span[2]', None),
+    ("place_type", '//div[@class="LBgpqf"]//button[@class="DkEaL "]', None),
+]
+
+# Resolves the whole spec in-page, so a listing costs one round trip instead of one per field.
+# Missing nodes give "" for text and null for attributes.
+PLACE_DETAILS_JS = """
+specs => {
+    const data = {};
+    for (const [key, xpath, attr] of specs) {
+        const node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (attr) {
+            data[key] = node ? (node.getAttribute(attr) || "") : null;
+        } else {
+            data[key] = node ? node.innerText : "";
+        }
+    }
+    return data;
+}
+"""
+
+# Hrefs of Instagram-labelled elements and of the visible instagram.com links in the details panel.
+# The main panel is the scope, so links from the results list (sidebar) are not picked up;
+# the whole body is the (risky) fallback when there is no panel.
+SOCIAL_LINKS_JS = """
+() => {
+    const root = document.querySelector('div[role="main"]') || document.body;
+    const visible = el => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== "hidden";
+    };
+    const aria = root.querySelectorAll('a[aria-label*="Instagram"], button[aria-label*="Instagram"]');
+    const links = Array.from(root.querySelectorAll('a[href*="instagram.com"]')).filter(visible);
+    return {
+        aria: Array.from(aria, el => el.getAttribute("href")).filter(href => href && href.includes("instagram.com")),
+        links: links.map(el => el.getAttribute("href")),
+    };
+}
+"""
+
+async def scroll_details_panel(page: Page):
+    """
+    Scrolls the details panel so lazy-loaded elements (like Social Profiles) are rendered.
+    """
+    try:
+        # Try to focus on the main panel
+        # The panel usually has role="main" and contains the place name
+        main_panel = page.locator(DETAILS_PANEL_SELECTOR).first
+        if await main_panel.count() > 0:
+            await main_panel.hover()
+            # Scroll down significantly
+            await page.mouse.wheel(0, 3000)
+            await page.mouse.wheel(0, 3000)
+            # Give lazy sections a moment, but stop waiting as soon as an Instagram link shows up
+            try:
+                await main_panel.locator(INSTAGRAM_LINK_SELECTOR).first.wait_for(state="attached", timeout=1500)
+            except TimeoutError:
+                pass
+        else:
+             # Fallback to keyboard
+            header_el = page.locator(PLACE_NAME_XPATH).first
+            if await header_el.count() > 0:
+                await header_el.click() # Focus
+                for _ in range(10): # Increased scroll amount
+                    await page.keyboard.press("PageDown")
+                # Same early exit as above instead of a fixed pause after every key press
+                try:
+                    await page.locator(INSTAGRAM_LINK_SELECTOR).first.wait_for(state="attached", timeout=1000)
+                except TimeoutError:
+                    pass
+    except Exception as e:
+        logging.warning("Failed to scroll details panel: %s", e)
+
+async def scan_instagram_links(page: Page, name: str) -> str:
+    """
+    Deep Scan for Instagram in the details panel (Social Profiles, Descriptions, etc.).
+    Returns the first link that matches the business name, or "".
+    """
+    try:
+        # Snapshot every candidate href in one round trip; the scope is picked in the page
+        social = await page.evaluate(SOCIAL_LINKS_JS)
+            
+        # Strategy 1: Look for aria-labels (common in Google Maps for social icons)
+        for href in social["aria"]:
+            if verify_instagram_match(name, href):
+                logging.info("Found Instagram via Aria Label: %s", href)
+                return href
+            else:
+                logging.info("Rejected Aria Label mismatch: %s for %s", href, name)
+        
+        # Strategy 2: Any visible instagram.com link within the scope
+        for href in social["links"]:
+            if "google.com" not in href:
+                 if verify_instagram_match(name, href):
+                     logging.info("Found Instagram via Deep Scan: %s", href)
+                     return href
+                 else:
+                     logging.info("Rejected Deep Scan mismatch: %s for %s", href, name) 
+    except Exception as e:
+        logging.warning("Deep scan for Instagram failed: %s", e)
+    return ""
+
+# Single-pass cleanup of the review fields: "(1,234)" -> "1234", "4,5" -> "4.5"
+REVIEWS_COUNT_TRANS = str.maketrans("", "", "\xa0(),")
+REVIEWS_AVG_TRANS = str.maketrans({",": ".", " ": None})
+# Narrow no-break spaces Maps puts before AM/PM
+OPENS_AT_TRANS = str.maketrans({"\u202f": None})
+
+async def extract_place(page: Page, web_search: bool = False, should_stop_callback=None) -> Place:
+    """
+    Reads the place open in `page`. With `web_search`, a missing Instagram link is looked up
+    on the fallback search engines, navigating `page` away from the place when it does.
+    """
+    data = await page.evaluate(PLACE_DETAILS_JS, PLACE_DETAILS_SPEC)
 
     place = Place()
-    place.name = extract_text(page, name_xpath)
+    place.name = data["name"]
     
     if should_stop_callback and should_stop_callback():
         return place
         
-    place.address = extract_text(page, address_xpath)
+    place.address = data["address"]
     
     # FAST FAIL: Check if address is clearly outside target region to avoid expensive processing
     if place.address:
         addr_lower = place.address.lower()
         if "united states" in addr_lower or "canada" in addr_lower or " usa " in addr_lower or " uk " in addr_lower or "united kingdom" in addr_lower:
-            logging.info(f"Fast fail: Address '{place.address}' is outside target region")
-            return place # Return early, will be filtered by step() logic
+            logging.info("Fast fail: Address '%s' is outside target region", place.address)
+            return place # Return early, will be filtered by accept_place()
     
-    # Extract website href
-    try:
-        if page.locator('//a[@data-item-id="authority"]').count() > 0:
-            url = page.locator('//a[@data-item-id="authority"]').get_attribute('href') or ""
-            if "instagram.com" in url:
-                if verify_instagram_match(place.name, url):
-                    place.instagram = url
-                    place.website = "invalid"
-                else:
-                    place.website = "invalid"
-                    logging.info(f"Rejected website mismatch: {url} for {place.name}")
-            elif "facebook.com" in url:
-                place.website = "invalid"
-            else:
-                place.website = url
+    # Website href
+    url = data["website_url"]
+    if url is None:
+        place.website = "invalid"
+    elif "instagram.com" in url:
+        if verify_instagram_match(place.name, url):
+            place.instagram = url
+            place.website = "invalid"
         else:
             place.website = "invalid"
-    except Exception as e:
-        logging.warning(f"Failed to extract website href: {e}")
-        place.website = extract_text(page, website_xpath) or "invalid"
+            logging.info("Rejected website mismatch: %s for %s", url, place.name)
+    elif "facebook.com" in url:
+        place.website = "invalid"
+    else:
+        place.website = url
 
     if should_stop_callback and should_stop_callback():
         return place
 
-    # Scroll the details panel to ensure lazy-loaded elements (like Social Profiles) are rendered
-    try:
-        # Try to focus on the main panel
-        # The panel usually has role="main" and contains the place name
-        main_panel = page.locator('div[role="main"]').first
-        if main_panel.count() > 0:
-            main_panel.hover()
-            # Scroll down significantly
-            page.mouse.wheel(0, 3000)
-            time.sleep(1.0)
-            page.mouse.wheel(0, 3000)
-            time.sleep(1.0)
-        else:
-             # Fallback to keyboard
-            header_el = page.locator(name_xpath).first
-            if header_el.count() > 0:
-                header_el.click() # Focus
-                for _ in range(10): # Increased scroll amount
-                    page.keyboard.press("PageDown")
-                    time.sleep(0.1)
-    except Exception as e:
-        logging.warning(f"Failed to scroll details panel: {e}")
+    # Cheapest first: a verified website link wins, then links already rendered in the panel,
+    # and only if those miss do we scroll for lazy-loaded sections (like Social Profiles)
+    if not place.instagram:
+        place.instagram = await scan_instagram_links(page, place.name)
 
-    # Deep Scan for Instagram in the details panel (Social Profiles, Descriptions, etc.)
-    # We look for any link containing instagram.com that is visible
-    try:
-        # Use the main panel as scope to avoid picking up links from the results list (sidebar)
-        main_panel = page.locator('div[role="main"]').first
-        if main_panel.count() > 0:
-            scope = main_panel
-        else:
-            scope = page # Fallback, though risky
-            
-        # Strategy 1: Look for aria-labels (common in Google Maps for social icons)
-        social_aria = scope.locator('a[aria-label*="Instagram"], button[aria-label*="Instagram"]').all()
-        for el in social_aria:
-            href = el.get_attribute('href')
-            if href and "instagram.com" in href:
-                if verify_instagram_match(place.name, href):
-                    place.instagram = href
-                    logging.info(f"Found Instagram via Aria Label: {href}")
-                    break
-                else:
-                    logging.info(f"Rejected Aria Label mismatch: {href} for {place.name}")
-        
-        if not place.instagram:
-            # Strategy 2: Scan all links within the scope
-            # Use CSS selector 'a' to ensure we only find descendants of the scope
-            social_links = scope.locator('a').all()
-            for link in social_links:
-                if not link.is_visible():
-                    continue
-                href = link.get_attribute('href')
-                if href and "instagram.com" in href:
-                    if "google.com" not in href:
-                         if verify_instagram_match(place.name, href):
-                             place.instagram = href
-                             logging.info(f"Found Instagram via Deep Scan: {href}")
-                             break
-                         else:
-                             logging.info(f"Rejected Deep Scan mismatch: {href} for {place.name}") 
-    except Exception as e:
-        logging.warning(f"Deep scan for Instagram failed: {e}")
+    if not place.instagram:
+        await scroll_details_panel(page)
+        place.instagram = await scan_instagram_links(page, place.name)
 
     # Double check if fallback extraction got a social link
     if "instagram.com" in place.website:
@@ -471,12 +712,14 @@ def extract_place(page: Page, context: BrowserContext = None, should_stop_callba
     if should_stop_callback and should_stop_callback():
         return place
 
-    # Fallback: Google Search if Instagram is still missing and context is provided
-    if not place.instagram and context and place.name:
+    # Fallback: web search if Instagram is still missing and it was asked for.
+    # Everything else was read into `data` already, so the search reuses this tab
+    # instead of opening one of its own
+    if not place.instagram and web_search and place.name:
         # Only search if we have a name
-        place.instagram = search_web_for_instagram(context, place.name, place.address, should_stop_callback)
+        place.instagram = await search_web_for_instagram_cached(page, place.name, place.address, should_stop_callback)
 
-    place.phone_number = extract_text(page, phone_number_xpath)
+    place.phone_number = data["phone_number"]
     
     # Phone Validation
     clean, p_type, valid = validate_lebanese_phone(place.phone_number)
@@ -484,113 +727,221 @@ def extract_place(page: Page, context: BrowserContext = None, should_stop_callba
     place.phone_type = p_type
     place.is_valid_phone = valid
     
-    place.place_type = extract_text(page, place_type_xpath)
+    place.place_type = data["place_type"]
 
     # Reviews Count
-    reviews_count_raw = extract_text(page, reviews_count_xpath)
+    reviews_count_raw = data["reviews_count"]
     if reviews_count_raw:
         try:
-            temp = reviews_count_raw.replace('\xa0', '').replace('(','').replace(')','').replace(',','')
+            temp = reviews_count_raw.translate(REVIEWS_COUNT_TRANS)
             place.reviews_count = int(temp)
         except Exception as e:
-            logging.warning(f"Failed to parse reviews count: {e}")
+            logging.warning("Failed to parse reviews count: %s", e)
     # Reviews Average
-    reviews_avg_raw = extract_text(page, reviews_average_xpath)
+    reviews_avg_raw = data["reviews_average"]
     if reviews_avg_raw:
         try:
-            temp = reviews_avg_raw.replace(' ','').replace(',','.')
+            temp = reviews_avg_raw.translate(REVIEWS_AVG_TRANS)
             place.reviews_average = float(temp)
         except Exception as e:
-            logging.warning(f"Failed to parse reviews average: {e}")
-    # Opens At
-    opens_at_raw = extract_text(page, opens_at_xpath)
+            logging.warning("Failed to parse reviews average: %s", e)
+    # Opens At ("Open ⋅ Closes 10 PM" -> " Closes 10 PM"), falling back to the second field
+    opens_at_raw = data["opens_at"] or data["opens_at2"]
     if opens_at_raw:
-        opens = opens_at_raw.split('⋅')
-        if len(opens) > 1:
-            place.opens_at = opens[1].replace("\u202f","")
-        else:
-            place.opens_at = opens_at_raw.replace("\u202f","")
-    else:
-        opens_at2_raw = extract_text(page, opens_at_xpath2)
-        if opens_at2_raw:
-            opens = opens_at2_raw.split('⋅')
-            if len(opens) > 1:
-                place.opens_at = opens[1].replace("\u202f","")
-            else:
-                place.opens_at = opens_at2_raw.replace("\u202f","")
+        left, sep, right = opens_at_raw.partition('⋅')
+        # Only the segment up to a further '⋅' is kept, as split('⋅')[1] did
+        piece = right.partition('⋅')[0] if sep else left
+        place.opens_at = piece.translate(OPENS_AT_TRANS)
     return place
 
-def handle_consent(page: Page):
+# Accept-all / I-agree consent buttons as one XPath union, so the check is a single round trip
+CONSENT_XPATH = (
+    '//button[contains(@aria-label, "Accept all")]'
+    ' | //button[.//span[contains(text(), "Accept all")]]'
+    ' | //button[.//div[contains(text(), "Accept all")]]'
+    ' | //button[.//span[contains(text(), "I agree")]]'
+)
+# Any button of the consent form, only tried when none of the above is there. It is kept
+# out of the union: a union matches in document order, and "Reject all" comes first
+CONSENT_FORM_BUTTON_XPATH = '//form[contains(@action, "consent")]//button'
+
+async def handle_consent(page: Page):
     try:
-        # Common consent button selectors
-        consent_selectors = [
-            '//button[contains(@aria-label, "Accept all")]',
-            '//button//span[contains(text(), "Accept all")]',
-            '//button//div[contains(text(), "Accept all")]',
-            '//button//span[contains(text(), "I agree")]',
-            'form[action*="consent"] button'
-        ]
-        
-        for selector in consent_selectors:
-            if page.locator(selector).count() > 0 and page.locator(selector).first.is_visible():
-                logging.info(f"Clicking consent button: {selector}")
-                page.locator(selector).first.click()
-                time.sleep(2)
+        # is_visible() is False when nothing matches, so the common no-consent case costs two calls
+        for xpath in (CONSENT_XPATH, CONSENT_FORM_BUTTON_XPATH):
+            button = page.locator(f"xpath={xpath} >> visible=true").first
+            if await button.is_visible():
+                logging.info("Clicking consent button")
+                await button.click()
+                # No fixed pause: the caller waits for the results to render
                 return
     except Exception as e:
         logging.warning(f"Consent handling failed: {e}")
 
+# Chromium flags for headless scraping in containers (small /dev/shm, no GPU)
+BROWSER_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--blink-settings=imagesEnabled=false",
+    # No component updates, safe-browsing list downloads or other idle traffic
+    "--disable-background-networking",
+]
+# Requests dropped in every tab: fonts, media, and ad and analytics beacons on Maps and the
+# fallback search engines. Images are already off through BROWSER_ARGS, and stylesheets stay
+# because the results panel only scrolls with them
+BLOCKED_EXTENSIONS = ("woff", "woff2", "ttf", "otf", "mp4", "webm", "mp3", "m3u8")
+BLOCKED_HOSTS = (
+    "fonts.gstatic.com", "doubleclick.net", "google-analytics.com", "googletagmanager.com",
+    "googlesyndication.com", "googleadservices.com", "scorecardresearch.com", "analytics.yahoo.com",
+)
+# As CDP wildcard patterns, which must match the whole URL. Extensions are tied to the end of
+# the path and hosts to the authority (the host or a subdomain of it), so a name that only
+# shows up in a query string is not blocked (unless it appears there as a whole unencoded
+# URL, since * also matches "/")
+BLOCKED_URL_PATTERNS = (
+    [f"*.{ext}{tail}" for ext in BLOCKED_EXTENSIONS for tail in ("", "?*")]
+    + [f"{scheme}://{sub}{host}/*" for host in BLOCKED_HOSTS for scheme in ("http", "https") for sub in ("", "*.")]
+)
+
+async def new_blocking_page(context: BrowserContext) -> Page:
+    """
+    Opens a tab in `context` with BLOCKED_URL_PATTERNS applied.
+    Blocking through CDP instead of context.route() keeps the HTTP cache on (a route turns it off),
+    so the Maps scripts are fetched once per scrape rather than once per place page.
+    """
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return page
+
+async def launch_browser(playwright: Playwright) -> Browser:
+    """
+    Launches headless Chromium, installing it first if it is missing.
+    """
+    try:
+        return await playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+    except Exception:
+        # Fallback for installation issues
+        logging.info("Browser launch failed. Attempting to install Playwright Chromium...")
+        try:
+            subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=True)
+            return await playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+        except Exception as e:
+            logging.error(f"Failed to install/launch browser: {e}")
+            raise e
+
+# [href, card address] for a slice of result links. The address is what follows the category
+# on the first "·" line that is not the rating line ("Seafood restaurant · Jounieh Highway");
+# hours, amenities and review snippets are left out. The place name (the link's aria-label)
+# is cut first so a name containing "·" is not taken for that line. "" when there is none.
+LISTING_CARDS_JS = """
+(els, [start, end]) => els.slice(start, end ?? els.length).map(a => {
+    const card = a.closest('[role="article"]') || a.parentElement;
+    const name = a.getAttribute("aria-label") || "";
+    const text = card ? card.innerText.replace(name, "") : "";
+    const line = text.split("\\n").find(l => l.includes("·") && !/^\\s*\\d/.test(l)) || "";
+    return [a.href, line.split("·").slice(1).join("·")];
+})
+"""
+
+# Scrolls the last result into view, then resolves as soon as a new result is attached
+# (true) or the end-of-list marker shows up / the timeout passes (false). A MutationObserver
+# on the results feed reacts to the DOM change instead of polling for it.
+SCROLL_FOR_MORE_JS = """
+([listingsSelector, endSelector, timeout]) => new Promise(resolve => {
+    const count = () => document.querySelectorAll(listingsSelector).length;
+    const listings = document.querySelectorAll(listingsSelector);
+    const prev = listings.length;
+    // scrollIntoView reaches the virtualized results panel even when wheel events miss it
+    if (prev) listings[prev - 1].scrollIntoView({block: "end"});
+    let observer, timer;
+    const finish = result => {
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(result);
+    };
+    const check = () => {
+        if (count() > prev) finish(true);
+        else if (document.querySelector(endSelector)) finish(false);
+    };
+    observer = new MutationObserver(check);
+    observer.observe(document.querySelector('div[role="feed"]') || document.body, {childList: true, subtree: true});
+    timer = setTimeout(() => finish(false), timeout);
+    check();
+})
+"""
+
 class GoogleMapsScraper:
-    def __init__(self):
+    def __init__(self, concurrency: int = DETAIL_CONCURRENCY):
         self.playwright = None
         self.browser = None
+        self.owns_browser = True
         self.context = None
         self.page = None
+        self.listings_locator = None
+        self.concurrency = max(1, min(concurrency, MAX_CONCURRENCY))
+        self.detail_semaphore = None
+        self.idle_detail_pages = []
         self.places = []
         self.processed_count = 0
-        self.stats = {"total_found": 0, "filtered_count": 0, "places": []}
+        self.stats = {"total_found": 0, "filtered_count": 0, "places": self.places}
         self.is_running = False
         self.search_for = ""
         self.total_target = 0
         self.required_area = None
         self.allowed_areas = []
         self.excluded_areas = []
+        # Case-folded copies for the address filters, computed once per scrape
+        self.required_area_cf = None
+        self.allowed_areas_cf = ()
+        self.excluded_areas_cf = ()
         self.seen_places = set()
+        self.seen_hrefs = set()
         
-    def start(self, search_for: str, total: int, required_area: str = None, excluded_areas: List[str] = None, allowed_areas: List[str] = None):
+    async def start(self, search_for: str, total: int, required_area: str = None, excluded_areas: List[str] = None, allowed_areas: List[str] = None, browser: Browser = None):
+        """
+        Opens the search in a fresh browser context.
+        Pass an already launched `browser` to skip the Chromium cold start; it is
+        left running on stop() and only this scrape's context is closed.
+        """
         setup_logging()
         self.search_for = search_for
         self.total_target = total
         self.required_area = required_area
         self.allowed_areas = allowed_areas or []
         self.excluded_areas = excluded_areas or []
+        self.required_area_cf = required_area.casefold() if required_area else None
+        self.allowed_areas_cf = tuple(area.casefold() for area in self.allowed_areas)
+        self.excluded_areas_cf = tuple(area.casefold() for area in self.excluded_areas)
         self.places = []
         self.processed_count = 0
-        self.stats = {"total_found": 0, "filtered_count": 0, "places": []}
+        # stats["places"] is the same list, so each place is stored once
+        self.stats = {"total_found": 0, "filtered_count": 0, "places": self.places}
         self.seen_places = set()
+        self.seen_hrefs = set()
+        self.detail_semaphore = asyncio.Semaphore(self.concurrency)
+        self.idle_detail_pages = []
         
-        self.playwright = sync_playwright().start()
-        
-        try:
-            self.browser = self.playwright.chromium.launch(headless=True)
-        except Exception:
-            # Fallback for installation issues
-            import subprocess
-            import sys
-            logging.info("Browser launch failed. Attempting to install Playwright Chromium...")
-            try:
-                subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=True)
-                self.browser = self.playwright.chromium.launch(headless=True)
-            except Exception as e:
-                logging.error(f"Failed to install/launch browser: {e}")
-                raise e
+        if browser:
+            self.playwright = None
+            self.browser = browser
+            self.owns_browser = False
+        else:
+            self.playwright = await async_playwright().start()
+            self.browser = await launch_browser(self.playwright)
+            self.owns_browser = True
             
-        self.context = self.browser.new_context(
+        self.context = await self.browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             geolocation={"latitude": 33.8938, "longitude": 35.5018}, # Beirut
-            permissions=["geolocation"]
+            permissions=["geolocation"],
+            viewport={"width": 1280, "height": 800},
+            extra_http_headers={"Accept-Language": "en-US"}
         )
-        self.page = self.context.new_page()
+        self.page = await new_blocking_page(self.context)
+        self.listings_locator = self.page.locator(LISTINGS_SELECTOR)
         
         # Navigate
         import urllib.parse
@@ -600,213 +951,449 @@ class GoogleMapsScraper:
         url = f"https://www.google.com/maps/search/{encoded_query}?hl=en&gl=lb"
         
         logging.info(f"Navigating to {url}")
-        self.page.goto(url, timeout=60000)
-        self.page.wait_for_timeout(5000)
+        await self.page.goto(url, timeout=60000)
         
-        handle_consent(self.page)
+        await handle_consent(self.page)
         
         # Initial wait for results
         try:
-            self.page.wait_for_selector('//a[contains(@href, "https://www.google.com/maps/place")]', timeout=30000)
+            await self.page.wait_for_selector(LISTINGS_SELECTOR, state="visible", timeout=30000)
         except TimeoutError:
             logging.warning("No results found.")
             return False
             
-        self.page.hover('//a[contains(@href, "https://www.google.com/maps/place")]')
+        await self.page.hover(LISTINGS_SELECTOR)
         self.is_running = True
         return True
 
-    def stop(self):
+    async def stop(self):
         """
-        Stops the scraper and closes the browser.
+        Stops the scraper and closes the browser (or just the context if the browser was borrowed).
         """
         self.is_running = False
         if self.context:
             try:
-                self.context.close()
-            except:
-                pass
-        if self.browser:
-            try:
-                self.browser.close()
-            except:
-                pass
-        if self.playwright:
-            try:
-                self.playwright.stop()
-            except:
+                await self.context.close()
+            except Exception:
                 pass
+        if self.owns_browser:
+            if self.browser:
+                try:
+                    await self.browser.close()
+                except Exception:
+                    pass
+            if self.playwright:
+                try:
+                    await self.playwright.stop()
+                except Exception:
+                    pass
+        # Drop the references so a second stop() is a no-op and start() begins clean
+        self.page = self.context = self.browser = self.playwright = None
+        self.idle_detail_pages = []
         logging.info("Scraper stopped.")
 
-    def step(self, should_stop_callback=None) -> Optional[Place]:
+    async def fetch_detail(self, href: str, should_stop_callback=None) -> Optional[Place]:
         """
-        Performs one step of scraping:
-        - Checks if we need to scroll
-        - Processes the next available listing
-        - Returns the Place object if found, or None if just scrolling/waiting
+        Opens a place URL in a detail tab and extracts it.
+        At most `concurrency` tabs exist; each is reused for the next place once it is free.
         """
-        if not self.is_running or len(self.places) >= self.total_target:
-            return None
-        
-        if should_stop_callback and should_stop_callback():
-             logging.info("Step interrupted by user stop request.")
-             return None
+        async with self.detail_semaphore:
+            if should_stop_callback and should_stop_callback():
+                return None
+            page = self.idle_detail_pages.pop() if self.idle_detail_pages else await new_blocking_page(self.context)
+            reusable = False
+            try:
+                # The name wait below is the real readiness gate, so don't also wait for the load event
+                await page.goto(href, wait_until="domcontentloaded", timeout=30000)
+                try:
+                    await page.wait_for_selector(PLACE_NAME_XPATH, state="visible", timeout=15000)
+                except TimeoutError:
+                    logging.warning("Details did not load for %s", href)
+                place = await extract_place(page, web_search=True, should_stop_callback=should_stop_callback)
+                reusable = True
+                return place
+            finally:
+                # A tab that failed or was cancelled mid-extraction is not trusted with the next place
+                if reusable:
+                    self.idle_detail_pages.append(page)
+                else:
+                    await page.close()
 
-        # Get current listings
-        listings_locator = self.page.locator('//a[contains(@href, "https://www.google.com/maps/place")]')
-        current_count = listings_locator.count()
+    def accept_place(self, place: Place) -> bool:
+        """
+        Applies deduplication and the area filters, updating stats.
+        """
+        # casefold() rather than lower() so non-ASCII addresses compare correctly
+        addr_cf = place.address.casefold()
         
-        # If we need more listings and have processed all current ones
-        if self.processed_count >= current_count:
-            logging.info("Scrolling for more results...")
-            self.page.mouse.wheel(0, 10000)
-            self.page.wait_for_timeout(3000)
+        # Deduplication
+        unique_key = (place.name.strip().casefold(), addr_cf.strip())
+        if unique_key in self.seen_places:
+            logging.info("Skipping duplicate: %s", place.name)
+            return False
+        self.seen_places.add(unique_key)
+        
+        # Filter Logic
+        self.stats["total_found"] += 1
+        
+        # 1. Area Filter
+        if self.allowed_areas:
+            # If we have a specific list of allowed sub-areas (including the main area)
+            # Check if ANY of them are in the address
+            matched_area = False
             
-            # Check if count increased
-            new_count = listings_locator.count()
-            if new_count <= current_count:
-                # End of list or load failed
-                logging.info("No new results after scroll.")
-                # We return None to indicate no place found this step, 
-                # but we might want to try scrolling again or stop.
-                # For now, let's try one more wait or just return None.
-                return None
-            return None # Just scrolled, return to let loop continue
+            # STRICT check: Address MUST contain "Lebanon" or the specific area
+            if "lebanon" not in addr_cf and self.required_area_cf and self.required_area_cf not in addr_cf:
+                 self.stats["filtered_count"] += 1
+                 logging.info("Skipped %s: Address '%s' missing 'Lebanon' or main area", place.name, place.address)
+                 return False
 
-        # Process the next listing
-        try:
-            listing = listings_locator.nth(self.processed_count)
-            listing.click()
-            self.page.wait_for_timeout(2000)
-            
-            if should_stop_callback and should_stop_callback():
-                logging.info("Step interrupted by user stop request during processing.")
-                return None
-            
-            place = extract_place(self.page, self.context, should_stop_callback)
-            self.processed_count += 1
-            
-            # Deduplication
-            unique_key = (place.name.strip().lower(), place.address.strip().lower())
-            if unique_key in self.seen_places:
-                logging.info(f"Skipping duplicate: {place.name}")
-                return None
-            self.seen_places.add(unique_key)
-            
-            # Filter Logic
-            self.stats["total_found"] += 1
-            
-            # 1. Area Filter
-            if self.allowed_areas:
-                # If we have a specific list of allowed sub-areas (including the main area)
-                # Check if ANY of them are in the address
-                matched_area = False
-                
-                # STRICT check: Address MUST contain "Lebanon" or the specific area
-                if "lebanon" not in place.address.lower() and self.required_area and self.required_area.lower() not in place.address.lower():
-                     self.stats["filtered_count"] += 1
-                     logging.info(f"Skipped {place.name}: Address '{place.address}' missing 'Lebanon' or main area")
-                     return None
-
-                for area in self.allowed_areas:
-                    if area.lower() in place.address.lower():
-                        matched_area = True
-                        break
-                
-                if not matched_area:
-                    self.stats["filtered_count"] += 1
-                    logging.info(f"Skipped {place.name}: Address '{place.address}' not in allowed areas {self.allowed_areas}")
-                    return None
+            for area_cf in self.allowed_areas_cf:
+                if area_cf in addr_cf:
+                    matched_area = True
+                    break
             
-            elif self.required_area:
-                # Legacy single area check
-                if self.required_area.lower() not in place.address.lower():
+            if not matched_area:
+                self.stats["filtered_count"] += 1
+                logging.info("Skipped %s: Address '%s' not in allowed areas %s", place.name, place.address, self.allowed_areas)
+                return False
+        
+        elif self.required_area:
+            # Legacy single area check
+            if self.required_area_cf not in addr_cf:
+                self.stats["filtered_count"] += 1
+                logging.info("Skipped %s: Address '%s' missing '%s'", place.name, place.address, self.required_area)
+                return False # Filtered out
+        
+        # 2. Excluded Areas Filter
+        if self.excluded_areas:
+            for excluded, excluded_cf in zip(self.excluded_areas, self.excluded_areas_cf):
+                if excluded_cf in addr_cf:
                     self.stats["filtered_count"] += 1
-                    logging.info(f"Skipped {place.name}: Address '{place.address}' missing '{self.required_area}'")
-                    return None # Filtered out
-            
-            # 2. Excluded Areas Filter
-            if self.excluded_areas:
-                for excluded in self.excluded_areas:
-                    if excluded.lower() in place.address.lower():
-                        self.stats["filtered_count"] += 1
-                        logging.info(f"Skipped {place.name}: Address '{place.address}' contains excluded '{excluded}'")
-                        return None # Filtered out
-            
-            # Valid Place
-            self.places.append(place)
-            self.stats["places"].append(place)
-            return place
-            
-        except Exception as e:
-            logging.error(f"Error processing listing {self.processed_count}: {e}")
-            self.processed_count += 1
-            return None
+                    logging.info("Skipped %s: Address '%s' contains excluded '%s'", place.name, place.address, excluded)
+                    return False # Filtered out
+        
+        return True
 
-    def stop(self):
-        self.is_running = False
-        if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+    def card_is_excluded(self, card_address: str) -> bool:
+        """
+        Cheap pre-filter on the result card's address segment, before the place is opened.
+        The card only shows a short address, so absence of the wanted area proves nothing;
+        a card is only skipped when it names an excluded area and none of the wanted ones.
+        """
+        if not self.excluded_areas_cf:
+            return False
+        text_cf = card_address.casefold()
+        if not any(excluded_cf in text_cf for excluded_cf in self.excluded_areas_cf):
+            return False
+        if self.required_area_cf and self.required_area_cf in text_cf:
+            return False
+        return not any(area_cf in text_cf for area_cf in self.allowed_areas_cf)
+
+    async def scroll_for_more(self, timeout: float = 5000) -> bool:
+        """
+        Scrolls the last result into view and returns as soon as a new listing is attached.
+        Returns False at the end of the list, or if nothing arrived within `timeout` ms.
+        """
+        # One round trip: the scroll, the wait and the count all happen in the page
+        return await self.page.evaluate(SCROLL_FOR_MORE_JS, [LISTINGS_SELECTOR, END_OF_LIST_SELECTOR, timeout])
+
+    def new_listing_hrefs(self, cards) -> List[str]:
+        """
+        Drops repeated and pre-filtered cards, returning the hrefs worth opening.
+        """
+        hrefs = []
+        for href, card_address in cards:
+            # Maps sometimes lists a place twice, not always under the same URL; skip it before paying for a tab.
+            # accept_place() still dedups by (name, address) for different links to one place
+            match = PLACE_ID_RE.search(href)
+            listing_key = match.group(1) if match else href
+            if listing_key in self.seen_hrefs:
+                logging.info("Skipping duplicate listing: %s", href)
+                continue
+            self.seen_hrefs.add(listing_key)
+            if self.card_is_excluded(card_address):
+                # Counted like a place rejected after extraction, just without opening it
+                self.stats["total_found"] += 1
+                self.stats["filtered_count"] += 1
+                logging.info("Skipped listing %s: card address is in an excluded area", href)
+                continue
+            hrefs.append(href)
+        return hrefs
+
+    async def produce_listings(self, queue: asyncio.Queue, done: asyncio.Event, should_stop_callback=None):
+        """
+        Feeds listing hrefs into `queue`, scrolling for more until the list ends,
+        the target is reached or a stop is requested. Ends with one None per consumer.
+        """
+        cancelled = False
+        try:
+            while not done.is_set():
+                if should_stop_callback and should_stop_callback():
+                    logging.info("Listing discovery interrupted by user stop request.")
+                    break
+                try:
+                    # Only the unread slice crosses over, so reading listings stays O(N) over the scrape
+                    cards = await self.listings_locator.evaluate_all(LISTING_CARDS_JS, [self.processed_count, None])
+                except Exception as e:
+                    logging.error("Error reading listings: %s", e)
+                    break
+                if not cards:
+                    logging.info("Scrolling for more results...")
+                    try:
+                        more = await self.scroll_for_more()
+                    except Exception as e:
+                        logging.error("Error scrolling for more results: %s", e)
+                        break
+                    if not more:
+                        # End of list or load failed
+                        logging.info("No new results after scroll.")
+                        break
+                    continue
+                self.processed_count += len(cards)
+                for href in self.new_listing_hrefs(cards):
+                    # Blocks while the queue is full, so discovery never runs far ahead of extraction
+                    await queue.put(href)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            # Whatever ends discovery, the consumers must get their end markers or they wait forever.
+            # Not when run() cancels us: it cancels the consumers too, and a full queue would block here
+            if not cancelled:
+                for _ in range(self.concurrency):
+                    await queue.put(None)
+
+    async def run(self, on_place=None, should_stop_callback=None):
+        """
+        Scrapes until the target is reached, the list ends or a stop is requested.
+        Discovery (scrolling) and extraction overlap: one producer feeds hrefs to
+        `concurrency` extractor tabs. `on_place` is called with each valid place.
+        """
+        if not self.is_running:
+            return
+        queue = asyncio.Queue(maxsize=LISTING_QUEUE_SIZE)
+        done = asyncio.Event()
+        if len(self.places) >= self.total_target:
+            done.set()
+
+        async def extract_listings():
+            while True:
+                href = await queue.get()
+                if href is None:
+                    return
+                try:
+                    place = await self.fetch_detail(href, should_stop_callback)
+                except Exception as e:
+                    logging.error("Error processing listing %s: %s", href, e)
+                    continue
+                if place is None or done.is_set() or not self.accept_place(place):
+                    continue
+                # Valid Place
+                self.places.append(place)
+                if on_place:
+                    on_place(place)
+                if len(self.places) >= self.total_target:
+                    done.set()
+
+        producer = asyncio.create_task(self.produce_listings(queue, done, should_stop_callback))
+        consumers = [asyncio.create_task(extract_listings()) for _ in range(self.concurrency)]
+        all_consumed = asyncio.gather(*consumers)
+        target_reached = asyncio.create_task(done.wait())
+        try:
+            finished, _ = await asyncio.wait({producer, all_consumed, target_reached}, return_when=asyncio.FIRST_COMPLETED)
+            if finished == {producer} and producer.exception() is None:
+                # Discovery is over; the consumers still work through what is queued
+                await asyncio.wait({all_consumed, target_reached}, return_when=asyncio.FIRST_COMPLETED)
+            # A failing producer or on_place/accept_place must not end the scrape as if it had finished
+            for task in (producer, all_consumed):
+                if task.done() and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            # Once the target is hit, tabs still extracting surplus listings are abandoned
+            for task in (producer, *consumers, target_reached):
+                task.cancel()
+            await asyncio.gather(producer, all_consumed, target_reached, return_exceptions=True)
 
 # Keep the original function for backward compatibility if needed, 
 # or redirect it to use the class (simplified).
-def scrape_places(search_for: str, total: int, callback=None, required_area: str = None, excluded_areas: List[str] = None) -> dict:
-    scraper = GoogleMapsScraper()
-    success = scraper.start(search_for, total, required_area, excluded_areas)
-    if not success:
-        scraper.stop()
-        return scraper.stats
-        
-    while len(scraper.places) < total:
-        place = scraper.step()
-        if place:
+async def scrape_places_async(search_for: str, total: int, callback=None, required_area: str = None, excluded_areas: List[str] = None, sink=None, concurrency: int = DETAIL_CONCURRENCY, browser: Browser = None) -> dict:
+    """
+    Pass an already launched `browser` to run several scrapes on one Chromium;
+    each scrape then only opens (and closes) its own context.
+    """
+    scraper = GoogleMapsScraper(concurrency)
+    try:
+        success = await scraper.start(search_for, total, required_area, excluded_areas, browser=browser)
+        if not success:
+            return scraper.stats
+            
+        def on_place(place: Place):
+            if sink:
+                sink(place)
             if callback:
                 callback(len(scraper.places), total, f"Found {place.name}")
-        
-        # Check if we are stuck (processed all but no new places) - simplistic check
-        listings_count = scraper.page.locator('//a[contains(@href, "https://www.google.com/maps/place")]').count()
-        if scraper.processed_count >= listings_count:
-             # Try scroll
-             scraper.page.mouse.wheel(0, 10000)
-             scraper.page.wait_for_timeout(2000)
-             if scraper.page.locator('//a[contains(@href, "https://www.google.com/maps/place")]').count() <= listings_count:
-                 break
-
-    scraper.stop()
+
+        await scraper.run(on_place)
+    finally:
+        await scraper.stop()
     return scraper.stats
 
+async def scrape_many_async(queries: List[str], total: int, sink=None, concurrency: int = DETAIL_CONCURRENCY) -> List[dict]:
+    """
+    Scrapes several queries (up to `total` places each) on one shared browser,
+    at most QUERY_CONCURRENCY at a time. Returns the stats of each query that did not fail, in order.
+    """
+    query_semaphore = asyncio.Semaphore(QUERY_CONCURRENCY)
+
+    async def scrape(query: str, browser: Browser) -> dict:
+        async with query_semaphore:
+            return await scrape_places_async(query, total, sink=sink, concurrency=concurrency, browser=browser)
+
+    async with async_playwright() as playwright:
+        browser = await launch_browser(playwright)
+        try:
+            # One failing query (e.g. a navigation timeout) must not take the others' results with it
+            results = await asyncio.gather(*(scrape(query, browser) for query in queries), return_exceptions=True)
+        finally:
+            await browser.close()
+
+    all_stats = []
+    for query, result in zip(queries, results):
+        if isinstance(result, BaseException):
+            logging.error("Query %r failed: %s", query, result)
+        else:
+            all_stats.append(result)
+    return all_stats
+
+def scrape_places(search_for: str, total: int, callback=None, required_area: str = None, excluded_areas: List[str] = None, sink=None, concurrency: int = DETAIL_CONCURRENCY) -> dict:
+    """
+    Runs a scrape to completion. `sink`, if given, is called with each valid place as soon as it is found.
+    """
+    return asyncio.run(scrape_places_async(search_for, total, callback, required_area, excluded_areas, sink, concurrency))
 
 
+
+
+# Buffer size for one-shot CSV writes (the streaming CLI path keeps the default)
+CSV_WRITE_BUFFER = 1 << 20
+# Compressed CSV by extension (result.csv.gz, result.csv.xz); both come with the stdlib.
+# Only gzip can flush mid-stream: an .xz file is complete only once it is closed
+COMPRESSED_CSV_OPENERS = {
+    ".gz": partial(gzip.open, compresslevel=6),
+    ".xz": lzma.open,
+}
+
+def open_places_csv(output_path: str = "result.csv", append: bool = False, buffering: int = -1):
+    """
+    Opens the output CSV for row-by-row writing and returns (file, csv writer).
+    The header is written unless appending to a non-empty file.
+    """
+    mode = "a" if append else "w"
+    opener = COMPRESSED_CSV_OPENERS.get(os.path.splitext(output_path)[1].lower())
+    if opener:
+        # Appending adds a new gzip member / xz stream, which readers decompress as one file.
+        # Plain utf-8: a BOM would end up in the middle of the text on append
+        write_header = not (append and os.path.isfile(output_path) and os.path.getsize(output_path) > 0)
+        f = opener(output_path, mode + "t", newline="", encoding="utf-8")
+    else:
+        f = open(output_path, mode, newline="", encoding="utf-8-sig", buffering=buffering)
+        # In append mode the position starts at the end, so 0 means a new or empty file
+        # (no separate exists check, and no race between the check and the open)
+        write_header = f.tell() == 0
+    writer = csv.writer(f)
+    if write_header:
+        writer.writerow(PLACE_FIELDS)
+    return f, writer
+
 def save_places_to_csv(places: List[Place], output_path: str = "result.csv", append: bool = False):
-    df = pd.DataFrame([asdict(place) for place in places])
-    if not df.empty:
-        file_exists = os.path.isfile(output_path)
-        mode = "a" if append else "w"
-        header = not (append and file_exists)
-        df.to_csv(output_path, index=False, mode=mode, header=header, encoding="utf-8-sig")
-        logging.info(f"Saved {len(df)} places to {output_path} (append={append})")
+    if not places:
+        logging.warning("No data to save. Place list is empty.")
+        return
+    # The whole list is written at once, so a large buffer turns it into a few big writes
+    f, writer = open_places_csv(output_path, append=append, buffering=CSV_WRITE_BUFFER)
+    with f:
+        writer.writerows(map(place_row, places))
+    logging.info(f"Saved {len(places)} places to {output_path} (append={append})")
+
+# Columnar output formats, picked by file extension; anything else is written as CSV
+ARROW_EXTENSIONS = (".parquet", ".feather")
+
+def save_places_to_arrow(places: List[Place], output_path: str, append: bool = False):
+    """
+    Writes places as a Parquet or Feather file (by extension) using pyarrow,
+    which streamlit already installs. Both formats are written whole, so
+    appending rewrites the file with the existing rows first.
+    """
+    if not places:
+        logging.warning("No data to save. Place list is empty.")
+        return
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    # Explicit types, so a column with no values (e.g. no reviews yet) is not typed as null
+    types = {"is_valid_phone": pa.bool_(), "reviews_count": pa.int64(), "reviews_average": pa.float64()}
+    schema = pa.schema([(name, types.get(name, pa.string())) for name in PLACE_FIELDS])
+    columns = zip(*map(place_row, places))
+    table = pa.Table.from_arrays([pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema)
+
+    is_parquet = output_path.lower().endswith(".parquet")
+    if append and os.path.isfile(output_path):
+        existing = pq.read_table(output_path) if is_parquet else feather.read_table(output_path)
+        table = pa.concat_tables([existing.cast(schema), table])
+    if is_parquet:
+        pq.write_table(table, output_path, compression="snappy")
     else:
-        logging.warning("No data to save. DataFrame is empty.")
+        feather.write_feather(table, output_path, compression="zstd")
+    logging.info(f"Saved {len(places)} places to {output_path} (append={append})")
+
+def save_places(places: List[Place], output_path: str = "result.csv", append: bool = False):
+    if output_path.lower().endswith(ARROW_EXTENSIONS):
+        save_places_to_arrow(places, output_path, append=append)
+    else:
+        save_places_to_csv(places, output_path, append=append)
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("-s", "--search", type=str, help="Search query for Google Maps")
-    parser.add_argument("-t", "--total", type=int, help="Total number of results to scrape")
-    parser.add_argument("-o", "--output", type=str, default="result.csv", help="Output CSV file path")
+    parser.add_argument("-s", "--search", type=str, action="append", help="Search query for Google Maps (repeat to run several queries in parallel)")
+    parser.add_argument("-f", "--queries-file", type=str, help="File with one search query per line, scraped on one shared browser")
+    parser.add_argument("-t", "--total", type=int, help="Total number of results to scrape per query")
+    parser.add_argument("-o", "--output", type=str, default="result.csv", help="Output file path (.csv, .csv.gz, .csv.xz, .parquet or .feather; .csv.xz is only complete after a clean exit)")
     parser.add_argument("--append", action="store_true", help="Append results to the output file instead of overwriting")
+    parser.add_argument("-c", "--concurrency", type=int, default=DETAIL_CONCURRENCY, help=f"Place pages extracted in parallel (1-{MAX_CONCURRENCY})")
     args = parser.parse_args()
     
-    search_for = args.search or "real estate companies in Beirut"
+    queries = list(args.search or [])
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as f:
+            queries.extend(line.strip() for line in f if line.strip())
+    queries = queries or ["real estate companies in Beirut"]
     total = args.total or 5
     output_path = args.output
     append = args.append
     
-    places = scrape_places(search_for, total)["places"]
-    save_places_to_csv(places, output_path, append=append)
+    if output_path.lower().endswith(ARROW_EXTENSIONS):
+        # Columnar files are written in one go once the scrape is done
+        all_stats = asyncio.run(scrape_many_async(queries, total, concurrency=args.concurrency))
+        save_places([place for stats in all_stats for place in stats["places"]], output_path, append=append)
+        return
+
+    # Rows are written as they are scraped, so an interrupted run keeps what it found
+    if output_path.lower().endswith(".xz"):
+        logging.warning("%s is only written out when the run ends cleanly; use .csv or .csv.gz to keep rows from an interrupted run", output_path)
+    f, writer = open_places_csv(output_path, append=append)
+
+    def write_place(place: Place):
+        writer.writerow(place_row(place))
+        # Places arrive seconds apart, so flushing each one is cheap and even a killed run keeps its rows
+        # (LZMAFile.flush() writes nothing, so not for .xz)
+        f.flush()
+
+    with f:
+        all_stats = asyncio.run(scrape_many_async(queries, total, sink=write_place, concurrency=args.concurrency))
+    saved = sum(len(stats["places"]) for stats in all_stats)
+    logging.info(f"Saved {saved} places to {output_path} (append={append})")
 
 if __name__ == "__main__":
     main()